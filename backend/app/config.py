@@ -27,6 +27,14 @@ class Settings(BaseSettings):
     # Database (optional; blog requires it)
     database_url: str | None = None  # env: DATABASE_URL
     postgres_url: str | None = None  # env: POSTGRES_URL
+    # Use SQLAlchemy's async engine (psycopg async / asyncpg) for the blog router
+    database_async: bool = False  # env: DATABASE_ASYNC
+    # Connection pool (ignored for SQLite)
+    db_pool_size: int = 5  # env: DB_POOL_SIZE
+    db_max_overflow: int = 10  # env: DB_MAX_OVERFLOW
+    db_pool_recycle: int = 1800  # seconds; -1 disables (env: DB_POOL_RECYCLE)
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection (env: DB_POOL_TIMEOUT)
+    db_pool_pre_ping: bool = True  # env: DB_POOL_PRE_PING
 
     @property
     def dsn(self) -> str | None:
@@ -42,6 +50,18 @@ class Settings(BaseSettings):
 
     # Blog
     seed_blog: bool = False
+    # Seconds a worker trusts its in-memory collection version before re-reading Redis/DB
+    blog_version_ttl: float = 1.0
+    # Bearer token that unlocks drafts on read endpoints; unset means drafts are never served
+    blog_admin_token: str | None = None  # env: BLOG_ADMIN_TOKEN
+    # Batch import: simultaneous article fetches per host (env: IMPORT_PER_HOST_CONCURRENCY)
+    import_per_host_concurrency: int = 8
+    # Article parsing runs in a process pool of this size; 0 parses in the threadpool (env: IMPORT_WORKERS)
+    import_workers: int = 2
+    import_parse_timeout: float = 30.0  # seconds per page (env: IMPORT_PARSE_TIMEOUT)
+    import_max_bytes: int = 5 * 1024 * 1024  # larger pages are rejected (env: IMPORT_MAX_BYTES)
+    # Seconds a parsed Substack feed is reused before a conditional refresh (env: SUBSTACK_FEED_TTL)
+    substack_feed_ttl: float = 300.0
 
     # Resume
     resume_file: str | None = None
@@ -56,9 +76,40 @@ class Settings(BaseSettings):
 
     # GitHub
     github_token: str | None = None
+    # Seconds a repo list may be served stale while it refreshes in the background (env: GITHUB_STALE_TTL)
+    github_stale_ttl: int = 86400
+    # Seconds an upstream 404 (unknown username) is cached (env: GITHUB_NEGATIVE_TTL)
+    github_negative_ttl: int = 300
+    # Requests left in the rate-limit window at which we stop calling GitHub (env: GITHUB_RATE_LIMIT_RESERVE)
+    github_rate_limit_reserve: int = 50
+    # Upper bound on pages fetched for ?all=true, 100 repos each (env: GITHUB_MAX_PAGES)
+    github_max_pages: int = 10
+    # Repo lists kept warm by a background task: "user", "user:30" (per_page) or "user:all" (env: GITHUB_WARM)
+    github_warm: str = ""
+    # Seconds between warm-up rounds, kept under the 300s freshness window (env: GITHUB_WARM_INTERVAL)
+    github_warm_interval: float = 240.0
+
+    # Shared upstream HTTP clients (GitHub, article imports)
+    http_max_connections: int = 20  # per client (env: HTTP_MAX_CONNECTIONS)
+    http_max_keepalive: int = 10  # env: HTTP_MAX_KEEPALIVE
+    http_keepalive_expiry: float = 30.0  # seconds an idle connection is kept (env: HTTP_KEEPALIVE_EXPIRY)
+    http2: bool = False  # needs httpx[http2] (env: HTTP2)
+    http_retries: int = 2  # retries of GET/HEAD on 429/5xx/connection errors (env: HTTP_RETRIES)
+    http_backoff: float = 0.25  # first retry delay in seconds, doubled each time (env: HTTP_BACKOFF)
+    http_circuit_failures: int = 5  # consecutive failures that open a host's circuit (env: HTTP_CIRCUIT_FAILURES)
+    http_circuit_cooldown: float = 30.0  # seconds before a trial request (env: HTTP_CIRCUIT_COOLDOWN)
 
     # Redis (optional; when set, GET responses are cached for signed-in / better UX)
     redis_url: str | None = None  # env: REDIS_URL
+    redis_max_connections: int = 50  # async client pool size (env: REDIS_MAX_CONNECTIONS)
+    # In-process LRU in front of Redis: entry and byte limits, and the longest a local copy lives (0 entries: off)
+    cache_local_max_entries: int = 1024  # env: CACHE_LOCAL_MAX_ENTRIES
+    cache_local_max_bytes: int = 32 * 1024 * 1024  # env: CACHE_LOCAL_MAX_BYTES
+    cache_local_ttl: float = 30.0  # env: CACHE_LOCAL_TTL
+    # Seconds a worker reuses a cache namespace generation without asking Redis (env: CACHE_GENERATION_TTL)
+    cache_generation_ttl: float = 1.0
+    # Cached response bodies at least this large are stored gzipped (env: CACHE_COMPRESS_MIN_BYTES)
+    cache_compress_min_bytes: int = 1024
 
     @property
     def effective_aws_region(self) -> str | None:
@@ -1,22 +1,25 @@
 """Portfolio FastAPI application."""
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.config import get_settings
 from app.routers import blog, contact, github, projects, resume, uploads
+from app.services import cache as cache_svc
+from app.services import http_clients, import_pool
 
 
-def _init_blog_db() -> None:
+async def _init_blog_db() -> None:
     """Initialize blog DB tables and optional seeding. Called at startup."""
     try:
-        blog.init_blog_db()
+        await blog.init_blog_db()
     except RuntimeError:
         pass  # DATABASE_URL not configured; other routers still work
 
@@ -24,8 +27,17 @@ def _init_blog_db() -> None:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """Application lifespan: startup and shutdown."""
-    _init_blog_db()
+    await _init_blog_db()
+    cache_svc.start()
+    import_pool.start()
+    http_clients.start()
+    github.start_warmup()
     yield
+    await github.stop_warmup()
+    await http_clients.close()
+    import_pool.shutdown()
+    await blog.close_blog_db()
+    await cache_svc.stop()
 
 
 def create_app() -> FastAPI:
@@ -58,6 +70,17 @@ def create_app() -> FastAPI:
     def health() -> dict:
         return {"status": "ok"}
 
+    @app.get("/api/health/ready")
+    async def health_ready() -> JSONResponse:
+        """Readiness with DB/Redis ping latency and pool stats; 503 only if the database is down."""
+        database = await blog.db_health()
+        redis = await asyncio.to_thread(cache_svc.health)
+        status = "ok" if database["ok"] and redis["ok"] else ("degraded" if database["ok"] else "unavailable")
+        return JSONResponse(
+            content={"status": status, "database": database, "redis": redis},
+            status_code=200 if database["ok"] else 503,
+        )
+
     # Next.js static export outputs to "out"; Vite uses "dist"
     _frontend_root = Path(__file__).resolve().parents[2] / "frontend"
     frontend_dist = (_frontend_root / "out").resolve() if (_frontend_root / "out").exists() else (_frontend_root / "dist").resolve()
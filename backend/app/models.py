@@ -20,12 +20,25 @@ class ContactMessage(BaseModel):
 	intent: str | None = None  # e.g. job opportunity, consulting, speaking, other
 
 
+class BlogTocEntry(BaseModel):
+    level: int
+    text: str
+    id: str
+
+
 class BlogPost(BaseModel):
     slug: str
     title: str
     summary: str
     content: str
     created_at: str
+    tags: list[str] = []
+    published: bool = True
+    # Precomputed at write time from content
+    content_html: str | None = None  # only with ?format=html
+    toc: list[BlogTocEntry] = []
+    word_count: int | None = None
+    reading_time: int | None = None  # minutes
 
 
 class BlogPostListItem(BaseModel):
@@ -35,15 +48,29 @@ class BlogPostListItem(BaseModel):
     created_at: str
 
 
+class BlogSearchResult(BlogPostListItem):
+    snippet: str  # HTML-escaped excerpt with matches wrapped in <mark>
+    rank: float
+
+
+class BlogTagCount(BaseModel):
+    tag: str
+    count: int
+
+
 class BlogPostCreate(BaseModel):
     title: str
     summary: str
     content: str
+    tags: list[str] = []
+    published: bool = True  # False saves a draft
 
 
 class BlogPostUpdate(BaseModel):
     title: str | None = None
     summary: str | None = None
     content: str | None = None
+    tags: list[str] | None = None
+    published: bool | None = None
 
 
@@ -1,46 +1,103 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import gzip
+import hmac
 import json
+import logging
 import re
-from datetime import UTC
-from typing import TYPE_CHECKING, Annotated
+import time
+import zlib
+from collections import Counter, OrderedDict
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from html import escape as html_escape
+from typing import TYPE_CHECKING, Annotated, Any, Literal, NamedTuple
 from urllib.parse import urlparse, urljoin
 
 import feedparser
 import httpx
 from bs4 import BeautifulSoup
 from fastapi import APIRouter, HTTPException, Query, Request
-from fastapi.responses import JSONResponse
-from markdownify import markdownify as md
-from pydantic import BaseModel, HttpUrl
+from fastapi.exceptions import RequestValidationError
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl, TypeAdapter, ValidationError
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
+    Float,
+    Index,
+    Integer,
     MetaData,
     String,
     Table,
     Text,
     create_engine,
     func,
+    make_url,
     select,
     text,
+    true,
+    tuple_,
 )
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import QueuePool
 
 from app.config import get_settings
-from app.models import BlogPost, BlogPostCreate, BlogPostListItem, BlogPostUpdate
+from app.models import (
+    BlogPost,
+    BlogPostCreate,
+    BlogPostListItem,
+    BlogPostUpdate,
+    BlogSearchResult,
+    BlogTagCount,
+)
 from app.services import cache as cache_svc
+from app.services import html_convert, http_clients, import_pool
+from app.utils import render_markdown
 
 if TYPE_CHECKING:
-    from sqlalchemy import Engine
+    from sqlalchemy import Connection, Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
 class Db:
     engine: Engine | None = None
+    async_engine: AsyncEngine | None = None
     table: Table | None = None
+    stats: Table | None = None
+    tag_counts: Table | None = None
+    feed_sync: Table | None = None
+
+
+def _engine_options(dsn: str) -> dict[str, Any]:
+    """Pool keyword arguments from settings. SQLite pools don't take sizing options."""
+    settings = get_settings()
+    options: dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if make_url(dsn).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle,
+            pool_timeout=settings.db_pool_timeout,
+        )
+    return options
 
 
 def _get_engine() -> Engine:
@@ -49,10 +106,109 @@ def _get_engine() -> Engine:
         dsn = settings.dsn
         if not dsn:
             raise RuntimeError("DATABASE_URL not configured")
-        Db.engine = create_engine(dsn, pool_pre_ping=True, future=True)
+        Db.engine = create_engine(dsn, future=True, **_engine_options(dsn))
     return Db.engine
 
 
+def _get_async_engine() -> AsyncEngine:
+    if Db.async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        settings = get_settings()
+        dsn = settings.dsn
+        if not dsn:
+            raise RuntimeError("DATABASE_URL not configured")
+        Db.async_engine = create_async_engine(dsn, **_engine_options(dsn))
+    return Db.async_engine
+
+
+class _PoolStats:
+    """Time spent waiting for a pooled connection, as observed by _run() and _connect()."""
+
+    acquired: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+
+    @classmethod
+    def record(cls, waited: float) -> None:
+        cls.acquired += 1
+        cls.wait_total += waited
+        cls.wait_max = max(cls.wait_max, waited)
+
+
+class _DbConn:
+    """Runs sync-style query functions ``fn(conn, *args)`` on either engine flavour.
+
+    With the async engine the function runs on the event loop via
+    AsyncConnection.run_sync; with the sync engine it runs in the threadpool.
+    """
+
+    def __init__(self, runner: Callable[..., Any]) -> None:
+        self._runner = runner
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await self._runner(fn, *args)
+
+
+def _run_unit(fn: Callable[..., Any], args: tuple[Any, ...], write: bool) -> Any:
+    """Sync engine: connect, run fn (in a transaction when write=True) and close on one thread."""
+    started = time.perf_counter()
+    with _get_engine().connect() as conn:
+        _PoolStats.record(time.perf_counter() - started)
+        if not write:
+            return fn(conn, *args)
+        with conn.begin():
+            return fn(conn, *args)
+
+
+async def _run(fn: Callable[..., Any], *args: Any, write: bool = False) -> Any:
+    """
+    One unit of work: fn(conn, *args) on its own connection, a transaction when write=True.
+    On the sync engine the whole unit is a single threadpool hop.
+    """
+    if get_settings().database_async:
+        async with _connect(write) as db:
+            return await db.run(fn, *args)
+    return await run_in_threadpool(_run_unit, fn, args, write)
+
+
+@asynccontextmanager
+async def _connect(write: bool = False) -> AsyncIterator[_DbConn]:
+    """
+    Connection (a transaction when write=True) from the configured engine, for work that
+    interleaves with other awaits (streamed backups and restores). Otherwise use _run().
+    """
+    started = time.perf_counter()
+    if get_settings().database_async:
+        async with _get_async_engine().connect() as aconn:
+            _PoolStats.record(time.perf_counter() - started)
+            async with aconn.begin() if write else nullcontext():
+                yield _DbConn(aconn.run_sync)
+        return
+
+    conn = await run_in_threadpool(_get_engine().connect)
+    _PoolStats.record(time.perf_counter() - started)
+
+    async def run_sync(fn: Callable[..., Any], *args: Any) -> Any:
+        return await run_in_threadpool(fn, conn, *args)
+
+    try:
+        if write:
+            await run_in_threadpool(conn.begin)
+        yield _DbConn(run_sync)
+        if write:
+            await run_in_threadpool(conn.commit)
+    except BaseException:
+        if write:
+            await run_in_threadpool(conn.rollback)
+        raise
+    finally:
+        await run_in_threadpool(conn.close)
+
+
+_MAX_TAG_LENGTH = 64
+
+
 def _get_table() -> Table:
     if Db.table is None:
         metadata = MetaData()
@@ -63,7 +219,8 @@ def _get_table() -> Table:
             Column("title", String(300), nullable=False),
             Column("summary", String(1000), nullable=False),
             Column("content", Text, nullable=False),
-            Column("tags", JSON, nullable=True),
+            # JSONB on Postgres so ?tag= filters can use a GIN containment index
+            Column("tags", JSON().with_variant(JSONB(), "postgresql"), nullable=True),
             Column("published", Boolean, server_default=text("true")),
             Column("created_at", DateTime(timezone=True), server_default=text("CURRENT_TIMESTAMP")),
             Column(
@@ -72,42 +229,401 @@ def _get_table() -> Table:
                 server_default=text("CURRENT_TIMESTAMP"),
                 onupdate=text("CURRENT_TIMESTAMP"),
             ),
+            # Render artifacts, computed from content on every write (see render_markdown)
+            Column("content_html", Text, nullable=True),
+            Column("toc", JSON, nullable=True),
+            Column("word_count", Integer, nullable=True),
+            Column("reading_time", Integer, nullable=True),
+        )
+        # Single-row collection stats (id=1), maintained in the same transaction as
+        # every write so list requests never need count(*) or max() scans.
+        # total counts published posts: it is the public X-Total-Count.
+        Db.stats = Table(
+            "blog_stats",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            Column("total", Integer, nullable=False, server_default=text("0")),
+            Column("version", BigInteger, nullable=False, server_default=text("0")),
+            Column("updated_at", DateTime(timezone=True), nullable=True),
+        )
+        # Public list pages walk this partial index, so drafts are never even visited
+        Index(
+            "idx_blog_posts_published_created_at_slug",
+            Db.table.c.created_at.desc(),
+            Db.table.c.slug.desc(),
+            postgresql_where=Db.table.c.published,
+            # Rendered as "published = 1" to match the predicate SQLAlchemy emits for SQLite
+            sqlite_where=Db.table.c.published == true(),
+        )
+        # Tag facet counts (published posts only), adjusted by every write that changes a post's tags
+        Db.tag_counts = Table(
+            "blog_tag_counts",
+            metadata,
+            Column("tag", String(_MAX_TAG_LENGTH), primary_key=True),
+            Column("count", Integer, nullable=False, server_default=text("0")),
+        )
+        # Per-newsletter feed sync state: validators for conditional GETs and the newest GUID seen
+        Db.feed_sync = Table(
+            "blog_feed_sync",
+            metadata,
+            Column("newsletter", String(200), primary_key=True),
+            Column("feed_url", String(500), nullable=True),
+            Column("etag", String(500), nullable=True),
+            Column("last_modified", String(100), nullable=True),
+            Column("last_guid", String(500), nullable=True),
+            Column("synced_at", DateTime(timezone=True), nullable=True),
         )
     return Db.table
 
 
-def init_blog_db() -> None:
+def _get_stats_table() -> Table:
+    _get_table()
+    assert Db.stats is not None
+    return Db.stats
+
+
+def _get_tag_counts_table() -> Table:
+    _get_table()
+    assert Db.tag_counts is not None
+    return Db.tag_counts
+
+
+def _get_feed_sync_table() -> Table:
+    _get_table()
+    assert Db.feed_sync is not None
+    return Db.feed_sync
+
+
+def _normalize_tags(tags: Iterable[str]) -> list[str]:
+    """Trimmed, lower-cased, whitespace-collapsed tags, de-duplicated in order. Raises HTTPException(422)."""
+    normalized: list[str] = []
+    for tag in tags:
+        tag = " ".join(tag.split()).lower()
+        if len(tag) > _MAX_TAG_LENGTH:
+            raise HTTPException(status_code=422, detail=f"Tag longer than {_MAX_TAG_LENGTH} characters")
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def _dialect_insert(conn: Connection) -> Callable[[Table], Any] | None:
+    """The dialect insert() supporting ON CONFLICT upserts, or None when the backend has no equivalent."""
+    if conn.dialect.name == "postgresql":
+        return postgresql_insert
+    if conn.dialect.name == "sqlite":
+        return sqlite_insert
+    return None
+
+
+def _adjust_tag_counts(conn: Connection, added: Iterable[str] = (), removed: Iterable[str] = ()) -> None:
+    """Apply one write's tag changes to blog_tag_counts, dropping tags no post uses any more."""
+    tag_counts = _get_tag_counts_table()
+    deltas = Counter(added)
+    deltas.subtract(removed)
+    insert = _dialect_insert(conn)
+    for tag, delta in deltas.items():
+        if delta == 0:
+            continue
+        if insert is not None:
+            # One atomic statement: concurrent writers adding the same new tag can't both miss the row
+            stmt = insert(tag_counts).values(tag=tag, count=delta)
+            conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[tag_counts.c.tag],
+                    set_={"count": tag_counts.c.count + delta},
+                )
+            )
+            continue
+        updated = conn.execute(
+            tag_counts.update().where(tag_counts.c.tag == tag).values(count=tag_counts.c.count + delta)
+        )
+        if updated.rowcount == 0 and delta > 0:
+            conn.execute(tag_counts.insert().values(tag=tag, count=delta))
+    if deltas:
+        conn.execute(tag_counts.delete().where(tag_counts.c.count <= 0))
+
+
+def _refresh_tag_counts(conn: Connection) -> None:
+    table = _get_table()
+    tag_counts = _get_tag_counts_table()
+    counts: Counter[str] = Counter()
+    for (tags,) in conn.execute(select(table.c.tags).where(table.c.published, table.c.tags.is_not(None))):
+        counts.update(tags)
+    conn.execute(tag_counts.delete())
+    if counts:
+        conn.execute(tag_counts.insert(), [{"tag": tag, "count": n} for tag, n in counts.items()])
+
+
+def _refresh_stats(conn: Connection) -> int:
+    """Recompute blog_stats and tag counts from blog_posts and bump the version. Used at startup and after restore."""
+    table = _get_table()
+    stats = _get_stats_table()
+    _refresh_tag_counts(conn)
+    total, max_updated = conn.execute(
+        select(func.count().filter(table.c.published), func.max(table.c.updated_at)).select_from(table)
+    ).one()
+    values = {"total": total, "updated_at": max_updated or datetime.now(UTC)}
+    updated = conn.execute(
+        stats.update().where(stats.c.id == 1).values(version=stats.c.version + 1, **values)
+    )
+    if updated.rowcount == 0:
+        conn.execute(stats.insert().values(id=1, version=1, **values))
+    return _select_version(conn)
+
+
+def _bump_stats(conn: Connection, total_delta: int = 0) -> int:
+    """Record a write in blog_stats: adjust the post count and advance the collection version."""
+    stats = _get_stats_table()
+    conn.execute(
+        stats.update()
+        .where(stats.c.id == 1)
+        .values(
+            total=stats.c.total + total_delta,
+            version=stats.c.version + 1,
+            updated_at=datetime.now(UTC),
+        )
+    )
+    return _select_version(conn)
+
+
+_VERSION_KEY = cache_svc.cache_key("version", "blog")
+
+
+class _Version:
+    """Process-local copy of blog_stats.version, trusted for settings.blog_version_ttl seconds."""
+
+    value: int | None = None
+    checked_at: float = 0.0
+
+
+async def _publish_version(version: int) -> None:
+    """Make a committed version visible to this worker immediately and to others via Redis."""
+    _Version.value = version
+    _Version.checked_at = time.monotonic()
+    await cache_svc.araise_counter(_VERSION_KEY, version)
+
+
+def _all(conn: Connection, stmt: Any) -> list[Any]:
+    return list(conn.execute(stmt).mappings().all())
+
+
+def _first(conn: Connection, stmt: Any) -> Any:
+    return conn.execute(stmt).mappings().first()
+
+
+def _select_version(conn: Connection) -> int:
+    stats = _get_stats_table()
+    return conn.execute(select(stats.c.version).where(stats.c.id == 1)).scalar() or 0
+
+
+async def _collection_version() -> int:
+    """Current collection version: memory, then Redis, then the blog_stats row."""
+    now = time.monotonic()
+    if _Version.value is not None and now - _Version.checked_at < get_settings().blog_version_ttl:
+        return _Version.value
+    version = await cache_svc.aget_counter(_VERSION_KEY)
+    if version is None:
+        version = await _run(_select_version)
+        await cache_svc.araise_counter(_VERSION_KEY, version)
+    _Version.value = version
+    _Version.checked_at = now
+    return version
+
+
+def _etag(version: int) -> str:
+    """Weak ETag for any blog representation; every write advances the version."""
+    return f'W/"b{version}"'
+
+
+async def init_blog_db() -> None:
     """Initialize blog DB tables and optional seeding. Called from app lifespan."""
-    engine = _get_engine()
+    if not get_settings().dsn:
+        raise RuntimeError("DATABASE_URL not configured")
+    version = await _run(_init_schema, write=True)
+    await _publish_version(version)
+
+
+def _pool_status() -> dict[str, Any]:
+    engine = Db.async_engine if get_settings().database_async else Db.engine
+    status: dict[str, Any] = {
+        "acquired": _PoolStats.acquired,
+        "wait_avg_ms": round(1000 * _PoolStats.wait_total / _PoolStats.acquired, 3) if _PoolStats.acquired else 0.0,
+        "wait_max_ms": round(1000 * _PoolStats.wait_max, 3),
+    }
+    if engine is None:
+        return status
+    pool = engine.pool
+    status["class"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
+async def db_health() -> dict[str, Any]:
+    """Database readiness: ping latency plus pool occupancy and checkout wait times."""
+    if not get_settings().dsn:
+        return {"configured": False, "ok": True}
+    started = time.perf_counter()
+    try:
+        await _run(_all, select(1))
+        ok, error = True, None
+    except Exception as e:
+        logger.warning("database readiness check failed", exc_info=True)
+        ok, error = False, type(e).__name__
+    health: dict[str, Any] = {
+        "configured": True,
+        "ok": ok,
+        "latency_ms": round(1000 * (time.perf_counter() - started), 3),
+        "pool": _pool_status(),
+    }
+    if error:
+        health["error"] = error
+    return health
+
+
+async def close_blog_db() -> None:
+    """Dispose engine pools. Called from app lifespan on shutdown."""
+    if Db.async_engine is not None:
+        await Db.async_engine.dispose()
+        Db.async_engine = None
+    if Db.engine is not None:
+        Db.engine.dispose()
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """create_all() never alters existing tables; add columns and indexes introduced after first deploy."""
+    table = _get_table()
+    existing = {c["name"] for c in sa_inspect(conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            col_type = column.type.compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}")
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+def _backfill_rendered(conn: Connection) -> None:
+    """Render posts stored before render artifacts existed."""
+    table = _get_table()
+    rows = conn.execute(
+        select(table.c.slug, table.c.content).where(table.c.content_html.is_(None))
+    ).all()
+    for slug, content in rows:
+        conn.execute(table.update().where(table.c.slug == slug).values(**render_markdown(content)))
+
+
+# Postgres: weighted tsvector kept current by the database itself, searched through a GIN index
+_PG_SEARCH_DDL = (
+    """
+    ALTER TABLE blog_posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_blog_posts_search ON blog_posts USING GIN (search_vector)",
+)
+
+# SQLite: external-content FTS5 index over blog_posts, maintained by triggers
+_SQLITE_SEARCH_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blog_posts_fts USING fts5(
+        title, summary, content, content='blog_posts', content_rowid='rowid', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ai AFTER INSERT ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(rowid, title, summary, content)
+        VALUES (new.rowid, new.title, new.summary, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_ad AFTER DELETE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, summary, content)
+        VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blog_posts_fts_au AFTER UPDATE ON blog_posts BEGIN
+        INSERT INTO blog_posts_fts(blog_posts_fts, rowid, title, summary, content)
+        VALUES ('delete', old.rowid, old.title, old.summary, old.content);
+        INSERT INTO blog_posts_fts(rowid, title, summary, content)
+        VALUES (new.rowid, new.title, new.summary, new.content);
+    END
+    """,
+    # rowids of a table with a TEXT primary key may change on VACUUM; resync every boot
+    "INSERT INTO blog_posts_fts(blog_posts_fts) VALUES ('rebuild')",
+)
+
+
+def _init_tags_index(conn: Connection) -> None:
+    """Postgres only: move a legacy json tags column to jsonb and index it for containment queries."""
+    if conn.dialect.name != "postgresql":
+        return
+    data_type = conn.exec_driver_sql(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'blog_posts' AND column_name = 'tags'"
+    ).scalar()
+    if data_type == "json":
+        conn.exec_driver_sql("ALTER TABLE blog_posts ALTER COLUMN tags TYPE jsonb USING tags::jsonb")
+    conn.exec_driver_sql(
+        "CREATE INDEX IF NOT EXISTS idx_blog_posts_tags ON blog_posts USING GIN (tags jsonb_path_ops)"
+    )
+
+
+def _init_search(conn: Connection) -> None:
+    ddl = {"postgresql": _PG_SEARCH_DDL, "sqlite": _SQLITE_SEARCH_DDL}.get(conn.dialect.name, ())
+    for statement in ddl:
+        conn.exec_driver_sql(statement)
+
+
+def _init_schema(conn: Connection) -> int:
+    """Create tables/indexes, optionally seed, and reconcile stats. Returns the stats version."""
     table = _get_table()
     settings = get_settings()
-    with engine.begin() as conn:
-        table.metadata.create_all(conn)
-        try:
-            conn.exec_driver_sql(
-                "CREATE INDEX IF NOT EXISTS idx_blog_posts_created_at ON blog_posts(created_at)"
+    table.metadata.create_all(conn)
+    _add_missing_columns(conn)
+    _init_tags_index(conn)
+    _init_search(conn)
+    try:
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS idx_blog_posts_created_at ON blog_posts(created_at)"
+        )
+        # Keyset pagination walks (created_at, slug) in descending order
+        conn.exec_driver_sql(
+            "CREATE INDEX IF NOT EXISTS idx_blog_posts_created_at_slug "
+            "ON blog_posts(created_at DESC, slug DESC)"
+        )
+    except Exception:
+        pass
+    if settings.seed_blog:
+        count = conn.execute(select(func.count()).select_from(table)).scalar_one()
+        if count == 0:
+            conn.execute(
+                table.insert().values([
+                    {
+                        "slug": "hello-world",
+                        "title": "Hello, world",
+                        "summary": "Welcome to my blog — first post seeded for demo.",
+                        "content": "This is a sample post created during initial seeding.",
+                    },
+                    {
+                        "slug": "real-time-ads-metrics-pipeline",
+                        "title": "A Minimal Real‑Time Ads Metrics Pipeline",
+                        "summary": "Kafka → Flink → Iceberg → Superset: pragmatic baseline.",
+                        "content": "Notes on design trade‑offs, checkpoints, and dashboarding.",
+                    },
+                ])
             )
-        except Exception:
-            pass
-        if settings.seed_blog:
-            count = conn.execute(select(func.count()).select_from(table)).scalar_one()
-            if count == 0:
-                conn.execute(
-                    table.insert().values([
-                        {
-                            "slug": "hello-world",
-                            "title": "Hello, world",
-                            "summary": "Welcome to my blog — first post seeded for demo.",
-                            "content": "This is a sample post created during initial seeding.",
-                        },
-                        {
-                            "slug": "real-time-ads-metrics-pipeline",
-                            "title": "A Minimal Real‑Time Ads Metrics Pipeline",
-                            "summary": "Kafka → Flink → Iceberg → Superset: pragmatic baseline.",
-                            "content": "Notes on design trade‑offs, checkpoints, and dashboarding.",
-                        },
-                    ])
-                )
+    _backfill_rendered(conn)
+    # Reconcile stats with the table once per boot (also self-heals drift)
+    return _refresh_stats(conn)
 
 
 def _slugify(title: str) -> str:
@@ -126,117 +642,432 @@ def _user_cache_hint(request: Request | None) -> str | None:
     return None
 
 
+def _is_admin(request: Request | None) -> bool:
+    """True when the request carries the configured admin bearer token; only such requests see drafts."""
+    token = get_settings().blog_admin_token
+    if not token or request is None:
+        return False
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+def _require_admin_for_drafts(request: Request | None) -> None:
+    """Writes that create, change or remove drafts are admin-only, like reading them."""
+    if not _is_admin(request):
+        raise HTTPException(status_code=403, detail="Drafts require the admin token")
+
+
+# Draft-bearing responses must stay out of Redis and shared caches
+_PRIVATE_CACHE_CONTROL = "private, no-store"
+
+
+def _encode_cursor(created_at: datetime | None, slug: str) -> str:
+    """Opaque keyset cursor: base64url of [created_at ISO, slug]."""
+    raw = json.dumps([created_at.isoformat() if created_at else None, slug], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime | None, str]:
+    """Inverse of _encode_cursor. Raises HTTPException(400) on a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, slug = json.loads(raw)
+        if not isinstance(slug, str):
+            raise ValueError("slug must be a string")
+        return (datetime.fromisoformat(created_at) if created_at else None, slug)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def _has_tag(table: Table, tag: str) -> Any:
+    """WHERE clause for posts carrying tag: JSONB containment (GIN-indexed) on Postgres, json_each elsewhere."""
+    if make_url(get_settings().dsn).get_backend_name() == "postgresql":
+        return type_coerce(table.c.tags, JSONB).contains([tag])
+    values = func.json_each(table.c.tags).table_valued("value")
+    return select(values.c.value).where(values.c.value == tag).exists()
+
+
+def _http_date(value: datetime) -> str:
+    """Format a datetime as an RFC 1123 HTTP date (naive values are treated as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.astimezone(UTC).strftime("%a, %d %b %Y %H:%M:%S GMT")
+
+
+def _not_modified(request: Request, etag: str | None, last_modified: str | None) -> bool:
+    """True when the request's validators match (If-None-Match wins over If-Modified-Since)."""
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        return bool(etag) and etag in [t.strip() for t in inm.split(",")]
+    ims = request.headers.get("if-modified-since")
+    return bool(last_modified) and ims == last_modified
+
+
+def _not_modified_response(etag: str | None, last_modified: str | None) -> Response:
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return Response(status_code=304, headers=headers)
+
+
+def _accepts_encoding(request: Request, encoding: str) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        if name.strip().lower() in (encoding, "*"):
+            q = params.strip().removeprefix("q=")
+            try:
+                return not q or float(q) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _send_cached(
+    request: Request, entry: cache_svc.CachedResponse, headers: dict[str, str] | None = None
+) -> Response:
+    """Send cached bytes as stored; only clients that refuse the stored encoding get them inflated."""
+    headers = {**entry.headers, **(headers or {})}
+    body = entry.body
+    if entry.encoding:
+        headers["Vary"] = "Accept-Encoding"
+        if _accepts_encoding(request, entry.encoding):
+            headers["Content-Encoding"] = entry.encoding
+        else:
+            body = gzip.decompress(body)
+    return Response(content=body, media_type=entry.media_type, headers=headers)
+
+
 @router.get("/")
-def list_posts(
+async def list_posts(
     request: Request,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=50),
+    cursor: str | None = Query(None, description="Opaque cursor from X-Next-Cursor; takes precedence over page"),
+    tag: str | None = Query(None, max_length=_MAX_TAG_LENGTH, description="Only posts carrying this tag"),
 ) -> Response:
-    # Redis cache: skip if conditional request (we'd need to return 304 from cache)
-    if not request.headers.get("if-none-match") and not request.headers.get("if-modified-since"):
-        user_hint = _user_cache_hint(request)
-        key = cache_svc.cache_key("blog:list", str(page), str(page_size), user_hint=user_hint)
-        ttl = 300 if user_hint else 60
-        cached = cache_svc.get_cached(key)
-        if cached is not None:
-            return JSONResponse(
-                content=cached["items"],
-                headers={
-                    "X-Total-Count": str(cached["total"]),
-                    "Content-Range": cached["content_range"],
-                    "Cache-Control": "public, max-age=60, stale-while-revalidate=120",
-                }
-            )
+    after = _decode_cursor(cursor) if cursor else None
+    page_key = f"c{cursor}" if cursor else str(page)
+    tag = " ".join(tag.split()).lower() if tag else None
+    # Admin reads include drafts and skip every shared cache and validator
+    admin = _is_admin(request)
+
+    # Revalidation fast path: compare against the in-memory version, no DB or Redis hit
+    if not admin and request.headers.get("if-none-match"):
+        etag = _etag(await _collection_version())
+        if _not_modified(request, etag, None):
+            return _not_modified_response(etag, None)
+
+    # Redis cache: entries carry their validators, so a matching conditional
+    # request is answered with 304 without touching the database
+    user_hint = _user_cache_hint(request)
+    key = await cache_svc.acache_key(
+        "blog:list", page_key, str(page_size), f"t{tag or ''}", user_hint=user_hint
+    )
+    ttl = 300 if user_hint else 60
+    cached = None if admin else await cache_svc.aget_response(key)
+    if cached is not None:
+        headers = cached.headers
+        if _not_modified(request, headers.get("ETag"), headers.get("Last-Modified")):
+            return _not_modified_response(headers.get("ETag"), headers.get("Last-Modified"))
+        return _send_cached(request, cached)
 
-    engine = _get_engine()
     table = _get_table()
+    stats = _get_stats_table()
     offset = (page - 1) * page_size
-    with engine.connect() as conn:
-        total = conn.execute(select(func.count()).select_from(table)).scalar_one()
-        # Compute validators for conditional caching
-        max_created_at = conn.execute(select(func.max(table.c.created_at))).scalar()
-        query = (
-            select(table.c.slug, table.c.title, table.c.summary, table.c.created_at)
-            .order_by(table.c.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
+    # Fetch one extra row to learn whether a next page exists
+    page_query = (
+        select(table.c.slug, table.c.title, table.c.summary, table.c.created_at)
+        .order_by(table.c.created_at.desc(), table.c.slug.desc())
+        .limit(page_size + 1)
+    )
+    total_col = stats.c.total
+    if admin:
+        # Maintained counts cover published posts only; the rare admin read counts directly
+        count_query = select(func.count()).select_from(table)
+        if tag:
+            count_query = count_query.where(_has_tag(table, tag))
+        total_col = count_query.scalar_subquery().label("total")
+    else:
+        # Matches the partial index predicate, so only published rows are read
+        page_query = page_query.where(table.c.published)
+    if tag:
+        page_query = page_query.where(_has_tag(table, tag))
+    if tag and not admin:
+        # The maintained facet count is the filtered total
+        tag_counts = _get_tag_counts_table()
+        total_col = func.coalesce(
+            select(tag_counts.c.count).where(tag_counts.c.tag == tag).scalar_subquery(), 0
+        ).label("total")
+    if after is not None:
+        # Keyset seek: cost is independent of how deep the page is
+        page_query = page_query.where(tuple_(table.c.created_at, table.c.slug) < tuple_(*after))
+    else:
+        page_query = page_query.offset(offset)
+    page_rows = page_query.subquery()
+    # One round trip: the stats row outer-joined with the page, so an empty
+    # page still yields the totals and validators
+    query = (
+        select(total_col, stats.c.version, stats.c.updated_at, *page_rows.c)
+        .select_from(stats.outerjoin(page_rows, true()))
+        .where(stats.c.id == 1)
+        .order_by(page_rows.c.created_at.desc(), page_rows.c.slug.desc())
+    )
+    rows = await _run(_all, query)
+    total = rows[0]["total"] if rows else 0
+    version = rows[0]["version"] if rows else 0
+    updated_at = rows[0]["updated_at"] if rows else None
+    rows = [row for row in rows if row["slug"] is not None]
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = _encode_cursor(rows[-1]["created_at"], rows[-1]["slug"])
+    items = [
+        BlogPostListItem(
+            slug=row["slug"],
+            title=row["title"],
+            summary=row["summary"],
+            created_at=row["created_at"].isoformat() if row["created_at"] else "",
         )
-        rows = conn.execute(query).mappings().all()
-        items = [
-            BlogPostListItem(
-                slug=row["slug"],
-                title=row["title"],
-                summary=row["summary"],
-                created_at=row["created_at"].isoformat() if row["created_at"] else "",
-            )
-            for row in rows
-        ]
-    # Conditional caching: ETag/Last-Modified
-    headers = {}
-    if max_created_at is not None:
-        try:
-            # Ensure aware datetime for consistent formatting
-            if getattr(max_created_at, "tzinfo", None) is None:
-                max_created_at = max_created_at.replace(tzinfo=UTC)
-            # Format Last-Modified as RFC 1123
-            last_mod_http = max_created_at.strftime("%a, %d %b %Y %H:%M:%S GMT")
-        except Exception:
-            last_mod_http = ""
-        # timestamp may not be available on some backends; fallback to iso hash
-        try:
-            ts_int = int(max_created_at.timestamp())  # type: ignore[attr-defined]
-        except Exception:
-            ts_int = 0
-        etag = f'W/"{total}-{ts_int}"'
-        # Check If-None-Match / If-Modified-Since
-        inm = request.headers.get("if-none-match")
-        ims = request.headers.get("if-modified-since")
-        if inm == etag or (last_mod_http and ims == last_mod_http):
-            # Not modified
-            return JSONResponse(
-                content=[],
-                status_code=304,
-                headers={
-                    "ETag": etag,
-                    "Last-Modified": last_mod_http,
-                }
-            )
-        headers["ETag"] = etag
-        if last_mod_http:
-            headers["Last-Modified"] = last_mod_http
+        for row in rows
+    ]
+
+    # Conditional caching: the stats version changes on every write (including edits)
+    headers = {"ETag": _etag(version)}
+    if updated_at is not None:
+        headers["Last-Modified"] = _http_date(updated_at)
+    if not admin and _not_modified(request, headers["ETag"], headers.get("Last-Modified")):
+        return _not_modified_response(headers["ETag"], headers.get("Last-Modified"))
 
     # Pagination and caching headers
-    end_index = offset + len(items) - 1 if items else offset
     headers["X-Total-Count"] = str(total)
-    headers["Content-Range"] = f"posts {offset}-{end_index}/{total}"
+    if after is None:
+        # Offset ranges are meaningless for cursor pages
+        end_index = offset + len(items) - 1 if items else offset
+        headers["Content-Range"] = f"posts {offset}-{end_index}/{total}"
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    items_dict = [i.model_dump() for i in items]
+    if admin:
+        headers["Cache-Control"] = _PRIVATE_CACHE_CONTROL
+        return JSONResponse(content=items_dict, headers=headers)
     headers["Cache-Control"] = "public, max-age=60, stale-while-revalidate=120"
 
-    # Store in Redis for next time (signed-in user gets longer TTL)
-    if not request.headers.get("if-none-match") and not request.headers.get("if-modified-since"):
-        user_hint = _user_cache_hint(request)
-        key = cache_svc.cache_key("blog:list", str(page), str(page_size), user_hint=user_hint)
-        ttl = 300 if user_hint else 60
-        items_dict = [i.model_dump() for i in items]
-        cache_svc.set_cached(key, {"items": items_dict, "total": total, "content_range": headers["Content-Range"]}, ttl)
+    # Store the encoded body in Redis for next time (signed-in user gets longer TTL)
+    entry = cache_svc.encode_response(items_dict, headers)
+    await cache_svc.aset_response(key, entry, ttl)
+    return _send_cached(request, entry)
+
+
+# Snippet match markers: control characters survive HTML escaping, then become <mark> tags
+_MARK_START, _MARK_STOP = "\x02", "\x03"
+
+_SEARCH_COLUMNS = {
+    "slug": String,
+    "title": String,
+    "summary": String,
+    "created_at": DateTime(timezone=True),
+    "rank": Float,
+    "snippet": Text,
+}
+
+_PG_SEARCH_SQL = """
+SELECT p.slug, p.title, p.summary, p.created_at, m.rank, m.total,
+       ts_headline('english', p.content, m.query,
+                   'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', MaxFragments=2, MaxWords=30, MinWords=8')
+           AS snippet
+FROM (
+    SELECT slug, created_at, ts_rank(search_vector, query) AS rank, count(*) OVER () AS total, query
+    FROM blog_posts, websearch_to_tsquery('english', :q) AS query
+    WHERE search_vector @@ query AND published
+    ORDER BY rank DESC, created_at DESC
+    LIMIT :limit OFFSET :offset
+) AS m
+JOIN blog_posts p ON p.slug = m.slug
+ORDER BY m.rank DESC, m.created_at DESC
+"""
+
+_SQLITE_SEARCH_SQL = """
+SELECT p.slug, p.title, p.summary, p.created_at,
+       -bm25(blog_posts_fts, 10.0, 4.0, 1.0) AS rank,
+       snippet(blog_posts_fts, -1, char(2), char(3), '…', 24) AS snippet
+FROM blog_posts_fts JOIN blog_posts p ON p.rowid = blog_posts_fts.rowid
+WHERE blog_posts_fts MATCH :q AND p.published
+ORDER BY rank DESC, p.created_at DESC
+LIMIT :limit OFFSET :offset
+"""
+
+
+def _fts5_query(q: str) -> str:
+    """Quote each word so user input can never be parsed as FTS5 query syntax."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", q)[:16])
+
+
+def _search(conn: Connection, q: str, limit: int, offset: int) -> tuple[list[Any], int]:
+    """Ranked matches for one page plus the total match count."""
+    params = {"limit": limit, "offset": offset}
+    if conn.dialect.name == "postgresql":
+        stmt = text(_PG_SEARCH_SQL).columns(**_SEARCH_COLUMNS, total=Integer)
+        rows = _all(conn, stmt.bindparams(q=q, **params))
+        return rows, (rows[0]["total"] if rows else 0)
+    if conn.dialect.name == "sqlite":
+        match = _fts5_query(q)
+        if not match:
+            return [], 0
+        stmt = text(_SQLITE_SEARCH_SQL).columns(**_SEARCH_COLUMNS)
+        rows = _all(conn, stmt.bindparams(q=match, **params))
+        total = conn.execute(
+            text(
+                "SELECT count(*) FROM blog_posts_fts JOIN blog_posts p ON p.rowid = blog_posts_fts.rowid "
+                "WHERE blog_posts_fts MATCH :q AND p.published"
+            ),
+            {"q": match},
+        ).scalar_one()
+        return rows, total
+    raise HTTPException(status_code=501, detail="Search is not supported on this database")
+
 
-    return JSONResponse(content=[i.model_dump() for i in items], headers=headers)
+def _highlight(snippet: str | None) -> str:
+    return html_escape(snippet or "").replace(_MARK_START, "<mark>").replace(_MARK_STOP, "</mark>")
+
+
+@router.get("/search")
+async def search_posts(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=50),
+) -> Response:
+    """Full-text search over title/summary/content, best matches first, with highlighted snippets."""
+    normalized = " ".join(q.lower().split())
+    user_hint = _user_cache_hint(request)
+    key = await cache_svc.acache_key(
+        "blog:search", normalized, str(page), str(page_size), user_hint=user_hint
+    )
+    ttl = 300 if user_hint else 60
+    cached = await cache_svc.aget_response(key)
+    if cached is not None:
+        return _send_cached(request, cached)
+
+    rows, total = await _run(_search, normalized, page_size, (page - 1) * page_size)
+    items = [
+        BlogSearchResult(
+            slug=row["slug"],
+            title=row["title"],
+            summary=row["summary"],
+            created_at=row["created_at"].isoformat() if row["created_at"] else "",
+            snippet=_highlight(row["snippet"]),
+            rank=round(float(row["rank"] or 0.0), 6),
+        ).model_dump()
+        for row in rows
+    ]
+    headers = {
+        "X-Total-Count": str(total),
+        "Cache-Control": "public, max-age=60, stale-while-revalidate=120",
+    }
+    # Cached until the next blog write bumps the "blog" generation, or TTL
+    entry = cache_svc.encode_response(items, headers)
+    await cache_svc.aset_response(key, entry, ttl)
+    return _send_cached(request, entry)
+
+
+@router.get("/tags", response_model=list[BlogTagCount])
+async def list_tags(request: Request) -> Response:
+    """Tag facets with post counts, most used first. Served from blog_tag_counts, never a table scan."""
+    etag = _etag(await _collection_version())
+    if _not_modified(request, etag, None):
+        return _not_modified_response(etag, None)
+    key = await cache_svc.acache_key("blog:tags")
+    cached = await cache_svc.aget_response(key)
+    if cached is None:
+        tag_counts = _get_tag_counts_table()
+        rows = await _run(
+            _all,
+            select(tag_counts.c.tag, tag_counts.c.count)
+            .where(tag_counts.c.count > 0)
+            .order_by(tag_counts.c.count.desc(), tag_counts.c.tag),
+        )
+        tags = [BlogTagCount(**row).model_dump() for row in rows]
+        cached = cache_svc.encode_response(tags, {"Cache-Control": "public, max-age=60, stale-while-revalidate=120"})
+        await cache_svc.aset_response(key, cached, 300)
+    return _send_cached(request, cached, {"ETag": etag})
+
+
+_BACKUP_BATCH_SIZE = 500
+
+_BACKUP_MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
+
+def _open_stream(conn: Connection, stmt: Any) -> Iterator[list[Any]]:
+    """Execute with a server-side cursor (where the driver has one) and return its row batches."""
+    result = conn.execution_options(stream_results=True, yield_per=_BACKUP_BATCH_SIZE).execute(stmt)
+    return result.mappings().partitions()
+
+
+def _next_backup_chunk(conn: Connection, batches: Iterator[list[Any]], fmt: str, first: bool) -> str | None:
+    """Fetch and serialize one batch. None once the cursor is exhausted."""
+    rows = next(batches, None)
+    if rows is None:
+        return None
+    docs = [_post_from_row(row).model_dump_json() for row in rows]
+    if fmt == "ndjson":
+        return "".join(f"{doc}\n" for doc in docs)
+    return ("" if first else ",") + ",".join(docs)
+
+
+async def _stream_backup(query: Any, fmt: str, compress: bool) -> AsyncIterator[bytes]:
+    """
+    Backup body in batches of _BACKUP_BATCH_SIZE rows: only one batch is ever held in memory,
+    and each fetch+serialize step runs off the event loop (threadpool or run_sync).
+    """
+    gz = zlib.compressobj(wbits=31) if compress else None  # wbits=31: gzip container
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return gz.compress(data) if gz else data
+
+    async with _connect() as db:
+        batches = await db.run(_open_stream, query)
+        if fmt == "json":
+            yield encode("[")
+        first = True
+        while (chunk := await db.run(_next_backup_chunk, batches, fmt, first)) is not None:
+            first = False
+            if data := encode(chunk):
+                yield data
+    tail = encode("]") if fmt == "json" else b""
+    yield tail + gz.flush() if gz else tail
 
 
 @router.get("/backup", response_model=list[BlogPost])
-def backup_posts() -> list[BlogPost]:
-    engine = _get_engine()
+async def backup_posts(
+    request: Request,
+    response: Response,
+    format: Literal["json", "ndjson"] | None = Query(
+        None, description="Stream the export as a JSON array or NDJSON; omit for a buffered list (small blogs)"
+    ),
+    compress: bool = Query(False, alias="gzip", description="gzip the streamed export"),
+) -> Any:
+    """All posts; drafts are included only for admin requests."""
     table = _get_table()
-    with engine.connect() as conn:
-        rows = conn.execute(table.select().order_by(table.c.created_at.desc())).mappings().all()
-        return [
-            BlogPost(
-                **{
-                    **row,
-                    "created_at": row["created_at"].isoformat() if row["created_at"] else "",
-                }
-            )
-            for row in rows
-        ]
+    query = table.select().order_by(table.c.created_at.desc())
+    admin = _is_admin(request)
+    if not admin:
+        query = query.where(table.c.published)
+    if format is not None:
+        headers = {"Content-Disposition": f'attachment; filename="blog-backup.{format}"'}
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        if admin:
+            headers["Cache-Control"] = _PRIVATE_CACHE_CONTROL
+        return StreamingResponse(
+            _stream_backup(query, format, compress), media_type=_BACKUP_MEDIA_TYPES[format], headers=headers
+        )
+    if admin:
+        response.headers["Cache-Control"] = _PRIVATE_CACHE_CONTROL
+    rows = await _run(_all, query)
+    return [_post_from_row(row) for row in rows]
 
 
 class RestoreItem(BaseModel):
@@ -245,26 +1076,170 @@ class RestoreItem(BaseModel):
     summary: str
     content: str
     created_at: str | None = None
+    tags: list[str] = []
+    published: bool = True
 
 
-@router.post("/restore", response_model=dict)
-def restore_posts(payload: list[RestoreItem]) -> dict:
-    engine = _get_engine()
+_RESTORE_BATCH_SIZE = 1000
+
+_restore_list = TypeAdapter(list[RestoreItem])
+
+
+def _restore_row(item: RestoreItem, now: datetime) -> dict[str, Any]:
+    try:
+        created_at = datetime.fromisoformat(item.created_at) if item.created_at else now
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid created_at for {item.slug!r}") from e
+    return {
+        "slug": item.slug,
+        "title": item.title,
+        "summary": item.summary,
+        "content": item.content,
+        "tags": _normalize_tags(item.tags),
+        "published": item.published,
+        "created_at": created_at,
+        "updated_at": now,
+        **render_markdown(item.content),
+    }
+
+
+def _upsert_posts(conn: Connection, items: list[RestoreItem]) -> None:
+    """
+    Insert or overwrite one batch of posts by slug, one executemany per kind of item.
+    Items without created_at are stamped with now when new and keep their timestamp when merged.
+    """
     table = _get_table()
-    with engine.begin() as conn:
-        conn.execute(table.delete())
-        for p in payload:
-            conn.execute(table.insert().values(
-                slug=p.slug,
-                title=p.title,
-                summary=p.summary,
-                content=p.content,
-            ))
-    return {"ok": True, "count": len(payload)}
+    now = datetime.now(UTC)
+    dated = [_restore_row(item, now) for item in items if item.created_at]
+    undated = [_restore_row(item, now) for item in items if not item.created_at]
+    insert = _dialect_insert(conn)
+    if insert is not None:
+        for rows, keep in ((dated, {"slug"}), (undated, {"slug", "created_at"})):
+            if not rows:
+                continue
+            stmt = insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.slug],
+                set_={name: stmt.excluded[name] for name in rows[0] if name not in keep},
+            )
+            conn.execute(stmt, rows)
+        return
+    if undated:
+        kept = dict(conn.execute(
+            select(table.c.slug, table.c.created_at).where(table.c.slug.in_([row["slug"] for row in undated]))
+        ).all())
+        for row in undated:
+            row["created_at"] = kept.get(row["slug"]) or now
+    rows = dated + undated
+    conn.execute(table.delete().where(table.c.slug.in_([row["slug"] for row in rows])))
+    conn.execute(table.insert(), rows)
+
+
+def _existing_slugs(conn: Connection, drafts_only: bool = False) -> set[str]:
+    table = _get_table()
+    query = select(table.c.slug)
+    if drafts_only:
+        query = query.where(table.c.published.is_(False))
+    return set(conn.execute(query).scalars())
+
+
+def _check_public_restore(items: list[RestoreItem], drafts: set[str]) -> None:
+    """A non-admin restore may only write published posts and must leave existing drafts alone."""
+    for item in items:
+        if not item.published or item.slug in drafts:
+            raise HTTPException(status_code=403, detail="Drafts require the admin token")
+
+
+def _delete_slugs(conn: Connection, slugs: list[str]) -> None:
+    table = _get_table()
+    for i in range(0, len(slugs), _RESTORE_BATCH_SIZE):
+        conn.execute(table.delete().where(table.c.slug.in_(slugs[i : i + _RESTORE_BATCH_SIZE])))
+
+
+async def _restore_batches(request: Request) -> AsyncIterator[list[RestoreItem]]:
+    """
+    Restore payload in batches: a JSON array is parsed whole (small restores), while
+    application/x-ndjson bodies are parsed line by line as they arrive.
+    """
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            batch: list[RestoreItem] = []
+            pending = b""
+            async for chunk in request.stream():
+                *lines, pending = (pending + chunk).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        batch.append(RestoreItem.model_validate_json(line))
+                    if len(batch) >= _RESTORE_BATCH_SIZE:
+                        yield batch
+                        batch = []
+            if pending.strip():
+                batch.append(RestoreItem.model_validate_json(pending))
+            if batch:
+                yield batch
+        else:
+            items = _restore_list.validate_json(await request.body())
+            for i in range(0, len(items), _RESTORE_BATCH_SIZE):
+                yield items[i : i + _RESTORE_BATCH_SIZE]
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False)) from e
+
+
+@router.post("/restore", response_model=dict)
+async def restore_posts(
+    request: Request,
+    mode: Literal["replace", "merge"] = Query(
+        "replace", description="replace: posts missing from the upload are deleted; merge: upsert only"
+    ),
+) -> dict:
+    """
+    Restore posts from a JSON array or an NDJSON upload (e.g. a /backup export), keeping created_at.
+
+    Batches are upserted by slug inside one transaction, so readers see either the old
+    or the restored blog and never an emptied table; replace then drops posts not uploaded.
+    Without the admin token a restore mirrors a public backup: drafts are neither written
+    nor deleted.
+    """
+    admin = _is_admin(request)
+    count = 0
+    seen: set[str] = set()
+    async with _connect(write=True) as db:
+        drafts = set() if admin else await db.run(_existing_slugs, True)
+        existing = await db.run(_existing_slugs) - drafts if mode == "replace" else set()
+        async for batch in _restore_batches(request):
+            if not admin:
+                _check_public_restore(batch, drafts)
+            await db.run(_upsert_posts, batch)
+            count += len(batch)
+            seen.update(item.slug for item in batch)
+        if existing - seen:
+            await db.run(_delete_slugs, sorted(existing - seen))
+        version = await db.run(_refresh_stats)
+    await _after_write(version)
+    return {"ok": True, "count": count}
 
 
 class BlogImportRequest(BaseModel):
     url: HttpUrl
+    tags: list[str] = []
+
+
+class BlogImportBatchRequest(BaseModel):
+    urls: list[HttpUrl] = Field(..., min_length=1, max_length=500)
+    tags: list[str] = []  # applied to every imported post
+
+
+class BlogImportResult(BaseModel):
+    url: str
+    ok: bool
+    slug: str | None = None
+    error: str | None = None
+
+
+class BlogImportBatchResponse(BaseModel):
+    imported: int
+    failed: int
+    results: list[BlogImportResult]
 
 
 def _substack_post_key_from_url(url: str) -> tuple[str | None, str | None]:
@@ -304,89 +1279,207 @@ def _substack_post_keys_for_matching(url: str) -> list[str]:
     return keys
 
 
-def _fetch_from_substack_rss(url: str) -> tuple[str, str, str] | None:
-    """Try to fetch article from Substack RSS feed. Returns None if not found."""
-    newsletter_name, post_key = _substack_post_key_from_url(url)
-    if not newsletter_name:
-        return None
-
-    rss_urls = [
+_BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+_RSS_HEADERS = {
+    "User-Agent": _BROWSER_USER_AGENT,
+    "Accept": "application/rss+xml, application/xml, text/xml",
+}
+_HTML_HEADERS = {
+    "User-Agent": _BROWSER_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def _substack_feed_urls(newsletter_name: str) -> list[str]:
+    return [
         f"https://{newsletter_name}.substack.com/feed",
         f"https://substack.com/@{newsletter_name}/feed",
     ]
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "application/rss+xml, application/xml, text/xml",
-    }
 
-    with httpx.Client(follow_redirects=True, timeout=15.0) as client:
-        for rss_url in rss_urls:
-            try:
-                resp = client.get(rss_url, headers=headers)
-                if resp.status_code != 200:
-                    continue
-                feed = feedparser.parse(resp.text)
-
-                post_keys = _substack_post_keys_for_matching(url)
-                for entry in feed.entries:
-                    entry_link = (entry.get("link") or "").strip()
-                    entry_id = (entry.get("id") or entry.get("guid") or "").strip()
-                    combined = f"{entry_link} {entry_id}"
-
-                    def link_matches() -> bool:
-                        if url in entry_link or entry_link in url:
-                            return True
-                        for key in post_keys:
-                            if key in entry_link or key in entry_id or key in combined:
-                                return True
-                        return False
-
-                    if not link_matches():
-                        continue
-
-                    title = entry.get("title", "")
-                    content = ""
-                    if "content" in entry and entry["content"]:
-                        content = entry["content"][0].get("value", "")
-                    elif "description" in entry:
-                        content = entry["description"]
-                    elif "summary" in entry:
-                        content = entry["summary"]
-
-                    if not content:
-                        continue
-
-                    content_soup = BeautifulSoup(content, "html.parser")
-                    for tag in content_soup.select("script, style"):
-                        tag.decompose()
-                    content_html = str(content_soup)
-                    content_md = md(
-                        content_html,
-                        heading_style="ATX",
-                        strip=["script", "style"],
-                        escape_asterisks=False,
-                        escape_underscores=False,
-                    )
-                    content_md = re.sub(r"\n{3,}", "\n\n", content_md).strip()
-                    if not content_md:
-                        continue
-
-                    plain = re.sub(r"\s+", " ", content_soup.get_text(separator=" ", strip=True))
-                    summary = (plain[:297] + "...") if len(plain) > 300 else plain
-                    if not summary:
-                        summary = title[:200] if title else ""
-
-                    return (title, summary, content_md)
-            except Exception:
-                continue
+class _Article(NamedTuple):
+    """One parsed article; published is the source's own publish date when it states one."""
+
+    title: str
+    summary: str
+    content: str
+    published: datetime | None = None
 
-    return None
 
+def _parse_published(value: Any) -> datetime | None:
+    """Aware datetime from a feed's struct_time (UTC) or an ISO 8601 string. None when missing or invalid."""
+    if isinstance(value, time.struct_time):
+        return datetime(*value[:6], tzinfo=UTC)
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        return None
+    # Normalized to UTC so imported rows compare and paginate like every other created_at
+    return parsed.astimezone(UTC) if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _entry_to_article(entry: Any) -> _Article | None:
+    """Convert one feed entry to an _Article. None if it has no usable content."""
+    title = entry.get("title", "")
+    content = ""
+    if "content" in entry and entry["content"]:
+        content = entry["content"][0].get("value", "")
+    elif "description" in entry:
+        content = entry["description"]
+    elif "summary" in entry:
+        content = entry["summary"]
+
+    if not content:
+        return None
 
-def _extract_substack_from_next_data(html: str, url: str) -> tuple[str, str, str] | None:
+    summary, content_md = html_convert.convert_fragment(content, title)
+    if not content_md:
+        return None
+    published = _parse_published(entry.get("published_parsed") or entry.get("updated_parsed"))
+    return _Article(title, summary, content_md, published)
+
+
+def _feed_link_key(link: str) -> str:
+    """host/path of a link, ignoring scheme, www., query and trailing slash."""
+    parsed = urlparse(link.strip())
+    host = (parsed.netloc or "").lower().removeprefix("www.")
+    return f"{host}{parsed.path.rstrip('/')}"
+
+
+def _post_slug(link: str) -> str | None:
+    """The segment after /p/ in a Substack post link."""
+    match = re.search(r"/p/([^/?#]+)", link)
+    return match.group(1) if match else None
+
+
+@dataclass
+class _SubstackFeed:
+    """One newsletter's parsed feed, indexed by link, slug, guid and numeric post id."""
+
+    feed_url: str | None  # None: no feed could be fetched (negative entry)
+    etag: str | None = None
+    last_modified: str | None = None
+    entries: list[Any] = field(default_factory=list)
+    index: dict[str, int] = field(default_factory=dict)
+    articles: dict[int, _Article | None] = field(default_factory=dict)  # converted lazily
+    checked_at: float = field(default_factory=time.monotonic)
+
+
+# newsletter name -> feed, least recently used first; shared by the single and batch import paths
+_FEEDS: OrderedDict[str, _SubstackFeed] = OrderedDict()
+_MAX_FEEDS = 256
+_FEED_REFRESHES: dict[str, asyncio.Task[_SubstackFeed]] = {}
+
+
+def _index_feed(feed_url: str, body: str, etag: str | None, last_modified: str | None) -> _SubstackFeed:
+    """Parse and index a feed body. CPU-bound: runs in the import pool."""
+    entries = feedparser.parse(body).entries
+    index: dict[str, int] = {}
+    for i, entry in enumerate(entries):
+        link = (entry.get("link") or "").strip()
+        guid = (entry.get("id") or entry.get("guid") or "").strip()
+        keys = [_feed_link_key(link) if link else None, _post_slug(link), guid or None]
+        for post_id in re.findall(r"\d{5,}", f"{link} {guid}"):
+            keys += [post_id, f"p-{post_id}"]
+        for key in keys:
+            if key:
+                index.setdefault(key, i)
+    return _SubstackFeed(feed_url=feed_url, etag=etag, last_modified=last_modified, entries=entries, index=index)
+
+
+def _feed_requests(newsletter_name: str, feed: _SubstackFeed | None) -> list[tuple[str, dict[str, str]]]:
+    """Feed URLs to try, last working one first, with conditional headers where validators are known."""
+    urls = _substack_feed_urls(newsletter_name)
+    if feed is not None and feed.feed_url in urls:
+        urls.remove(feed.feed_url)
+        urls.insert(0, feed.feed_url)
+    requests = []
+    for feed_url in urls:
+        headers = dict(_RSS_HEADERS)
+        if feed is not None and feed.feed_url == feed_url:
+            if feed.etag:
+                headers["If-None-Match"] = feed.etag
+            if feed.last_modified:
+                headers["If-Modified-Since"] = feed.last_modified
+        requests.append((feed_url, headers))
+    return requests
+
+
+async def _fetch_feed(
+    client: httpx.AsyncClient, feed: _SubstackFeed | None, feed_url: str, headers: dict[str, str]
+) -> _SubstackFeed | None:
+    """
+    Conditional GET of one feed URL: feed itself on 304, a freshly indexed feed on 200, None otherwise.
+    The body is capped like article pages and parsed in the import pool.
+    """
+    async with client.stream("GET", feed_url, headers=headers, timeout=15.0) as resp:
+        if resp.status_code == 304 and feed is not None and feed.feed_url == feed_url:
+            feed.checked_at = time.monotonic()
+            return feed
+        if resp.status_code != 200:
+            return None
+        body = await _read_capped(resp)
+        etag, last_modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+    indexed = await import_pool.run(_index_feed, feed_url, body, etag, last_modified)
+    indexed.checked_at = time.monotonic()
+    return indexed
+
+
+def _cached_feed(newsletter_name: str) -> _SubstackFeed | None:
+    feed = _FEEDS.get(newsletter_name)
+    if feed is not None:
+        _FEEDS.move_to_end(newsletter_name)
+    return feed
+
+
+def _remember_feed(newsletter_name: str, feed: _SubstackFeed) -> _SubstackFeed:
+    """Cache feed as most recently used, evicting the least recently used past _MAX_FEEDS."""
+    _FEEDS[newsletter_name] = feed
+    _FEEDS.move_to_end(newsletter_name)
+    while len(_FEEDS) > _MAX_FEEDS:
+        _FEEDS.popitem(last=False)
+    return feed
+
+
+def _feed_is_fresh(feed: _SubstackFeed | None) -> bool:
+    return feed is not None and time.monotonic() - feed.checked_at < get_settings().substack_feed_ttl
+
+
+async def _refresh_feed(client: httpx.AsyncClient, newsletter_name: str) -> _SubstackFeed:
+    feed = _cached_feed(newsletter_name)
+    for feed_url, headers in _feed_requests(newsletter_name, feed):
+        try:
+            updated = await _fetch_feed(client, feed, feed_url, headers)
+        except Exception:
+            continue
+        if updated is not None:
+            return _remember_feed(newsletter_name, updated)
+    if feed is not None:
+        # A transient failure keeps serving the stale feed until the next TTL
+        feed.checked_at = time.monotonic()
+        return feed
+    return _remember_feed(newsletter_name, _SubstackFeed(feed_url=None))
+
+
+async def _lookup_article(feed: _SubstackFeed, url: str) -> _Article | None:
+    """Dictionary lookup of url in the feed index; the entry is converted once (in the import pool) and memoized."""
+    keys = [_feed_link_key(url), _post_slug(url), *_substack_post_keys_for_matching(url)]
+    position = next((feed.index[key] for key in keys if key and key in feed.index), None)
+    if position is None:
+        return None
+    if position not in feed.articles:
+        feed.articles[position] = await import_pool.run(_entry_to_article, feed.entries[position])
+    return feed.articles[position]
+
+
+def _extract_substack_from_next_data(soup: BeautifulSoup) -> _Article | None:
     """Try to extract post title and body from Substack __NEXT_DATA__ script. Returns None on failure."""
-    soup = BeautifulSoup(html, "html.parser")
     script = soup.find("script", id="__NEXT_DATA__", type="application/json")
     if not script or not script.string:
         return None
@@ -403,55 +1496,40 @@ def _extract_substack_from_next_data(html: str, url: str) -> tuple[str, str, str
         body = post.get("body") or post.get("bodyHtml") or post.get("content")
         if not title or not body:
             return None
-        content_soup = BeautifulSoup(body, "html.parser")
-        for tag in content_soup.select("script, style"):
-            tag.decompose()
-        content_md = md(
-            str(content_soup),
-            heading_style="ATX",
-            strip=["script", "style"],
-            escape_asterisks=False,
-            escape_underscores=False,
-        )
-        content_md = re.sub(r"\n{3,}", "\n\n", content_md).strip()
+        summary, content_md = html_convert.convert_fragment(body, title)
         if not content_md:
             return None
-        plain = re.sub(r"\s+", " ", content_soup.get_text(separator=" ", strip=True))
-        summary = (plain[:297] + "...") if len(plain) > 300 else plain
-        if not summary:
-            summary = title[:200]
-        return (title, summary, content_md)
+        return _Article(title, summary, content_md, _parse_published(post.get("post_date")))
     except (KeyError, TypeError, AttributeError):
         return None
 
 
-def _fetch_and_parse_article(url: str) -> tuple[str, str, str]:
-    """Fetch URL, parse HTML, return (title, summary, content_markdown). Raises ValueError on failure."""
-    parsed = urlparse(url)
-    is_substack = "substack.com" in (parsed.netloc or "").lower()
+def _is_substack(url: str) -> bool:
+    return "substack.com" in (urlparse(url).netloc or "").lower()
 
-    if is_substack:
-        rss_result = _fetch_from_substack_rss(url)
-        if rss_result:
-            return rss_result
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
-    with httpx.Client(follow_redirects=True, timeout=20.0) as client:
-        resp = client.get(url, headers=headers)
-        resp.raise_for_status()
-        html = resp.text
+def _page_published(soup: BeautifulSoup) -> datetime | None:
+    """Publish date from article:published_time / datePublished meta tags, then the first <time datetime>."""
+    meta = soup.find("meta", property="article:published_time") or soup.find("meta", itemprop="datePublished")
+    if meta and meta.get("content"):
+        return _parse_published(meta["content"])
+    tag = soup.find("time", datetime=True)
+    return _parse_published(tag["datetime"]) if tag else None
+
+
+def _parse_article_html(html: str, url: str) -> _Article:
+    """Parse a fetched article page into an _Article. Raises ValueError on failure."""
+    parsed = urlparse(url)
+    is_substack = _is_substack(url)
+
+    # The page is parsed exactly once; title, body, summary and markdown all come from this tree
+    soup = html_convert.parse(html)
 
     if is_substack:
-        next_data_result = _extract_substack_from_next_data(html, url)
+        next_data_result = _extract_substack_from_next_data(soup)
         if next_data_result:
             return next_data_result
 
-    soup = BeautifulSoup(html, "html.parser")
-
     # Title: og:title, then <title>, then first h1
     title = ""
     og_title = soup.find("meta", property="og:title")
@@ -465,6 +1543,7 @@ def _fetch_and_parse_article(url: str) -> tuple[str, str, str]:
             title = h1.get_text(strip=True)
     if not title:
         raise ValueError("Could not extract title from page")
+    published = _page_published(soup)  # before stripping: <time> often sits in a stripped header
 
     # Main content: platform-specific selectors then fallbacks
     article_body = None
@@ -497,113 +1576,425 @@ def _fetch_and_parse_article(url: str) -> tuple[str, str, str]:
         raise ValueError("Could not find article content on page")
 
     # Strip script/style and convert to markdown
-    for tag in article_body.select("script, style, nav, header, footer, .comments"):
-        tag.decompose()
-    content_html = str(article_body)
-    content_md = md(
-        content_html,
-        heading_style="ATX",
-        strip=["script", "style"],
-        escape_asterisks=False,
-        escape_underscores=False,
-    )
-    content_md = re.sub(r"\n{3,}", "\n\n", content_md).strip()
+    html_convert.strip_tags(article_body, "script, style, nav, header, footer, .comments")
+    summary, content_md = html_convert.convert(article_body, title)
     if not content_md:
         raise ValueError("Article content was empty after conversion")
 
-    # Summary: first 300 chars of plain text
-    plain = re.sub(r"\s+", " ", BeautifulSoup(content_html, "html.parser").get_text(separator=" ", strip=True))
-    summary = (plain[:297] + "...") if len(plain) > 300 else plain
-    if not summary:
-        summary = title[:200]
+    return _Article(title, summary, content_md, published)
 
-    return (title, summary, content_md)
+
+async def _fetch_from_substack_rss(client: httpx.AsyncClient, url: str) -> _Article | None:
+    """Article for url from its newsletter's cached feed. Concurrent imports of one newsletter share a single refresh."""
+    newsletter_name, _ = _substack_post_key_from_url(url)
+    if not newsletter_name:
+        return None
+    feed = _cached_feed(newsletter_name)
+    if not _feed_is_fresh(feed):
+        task = _FEED_REFRESHES.get(newsletter_name)
+        if task is None:
+            task = asyncio.ensure_future(_refresh_feed(client, newsletter_name))
+            _FEED_REFRESHES[newsletter_name] = task
+            task.add_done_callback(lambda _: _FEED_REFRESHES.pop(newsletter_name, None))
+        feed = await asyncio.shield(task)
+    assert feed is not None
+    return await _lookup_article(feed, url)
+
+
+async def _read_capped(resp: httpx.Response) -> str:
+    """Body of a streamed response, refusing more than settings.import_max_bytes (ValueError)."""
+    limit = get_settings().import_max_bytes
+    if int(resp.headers.get("content-length") or 0) > limit:
+        raise ValueError(f"Page is larger than {limit} bytes")
+    body = bytearray()
+    async for chunk in resp.aiter_bytes():
+        body += chunk
+        if len(body) > limit:
+            raise ValueError(f"Page is larger than {limit} bytes")
+    return body.decode(resp.encoding or "utf-8", errors="replace")
+
+
+async def _fetch_page(client: httpx.AsyncClient, url: str) -> str:
+    """GET an article page, refusing bodies over settings.import_max_bytes (ValueError)."""
+    async with client.stream("GET", url, headers=_HTML_HEADERS) as resp:
+        resp.raise_for_status()
+        return await _read_capped(resp)
+
+
+async def _fetch_and_parse_article(client: httpx.AsyncClient, url: str) -> _Article:
+    """Fetch URL and parse it into an _Article. Raises httpx.HTTPError or ValueError."""
+    if _is_substack(url):
+        rss_result = await _fetch_from_substack_rss(client, url)
+        if rss_result:
+            return rss_result
+    html = await _fetch_page(client, url)
+    # Multi-megabyte pages are pure-Python CPU work: keep it out of this process's GIL
+    return await import_pool.run(_parse_article_html, html, url)
 
 
 @router.post("/import", response_model=BlogPost)
-def import_post(payload: BlogImportRequest, request: Request) -> BlogPost:
+async def import_post(payload: BlogImportRequest, request: Request) -> BlogPost:
     """Import a single post from a Medium or Substack article URL."""
     url_str = str(payload.url)
     try:
-        title, summary, content_md = _fetch_and_parse_article(url_str)
+        article = await _fetch_and_parse_article(http_clients.web(), url_str)
     except httpx.HTTPError as e:
         raise HTTPException(status_code=422, detail=f"Could not fetch URL: {e!s}")
     except ValueError as e:
         raise HTTPException(status_code=422, detail=str(e))
 
-    return create_post(BlogPostCreate(title=title, summary=summary, content=content_md), request=request)
+    return await create_post(
+        BlogPostCreate(title=article.title, summary=article.summary, content=article.content, tags=payload.tags),
+        request=request,
+    )
 
 
-@router.get("/{slug}")
-def get_post(slug: str, request: Request) -> BlogPost:
-    user_hint = _user_cache_hint(request) if request else None
-    key = cache_svc.cache_key("blog:post", slug, user_hint=user_hint)
-    ttl = 300 if user_hint else 60
-    cached = cache_svc.get_cached(key)
-    if cached is not None:
-        return BlogPost(**cached)
+def _insert_imported(
+    conn: Connection, urls: list[str], outcomes: list[_Article | str], tags: list[str]
+) -> tuple[list[BlogImportResult], int | None]:
+    """
+    Insert every successfully parsed article in one executemany. outcomes holds an _Article
+    or an error message per URL. Articles keep their source publish date as created_at (now
+    when the source has none), so imports list in their original order. Returns per-URL
+    results and the new version (None when nothing was inserted).
+    """
+    table = _get_table()
+    tags = _normalize_tags(tags)
+    slugs = {_slugify(o[0]) for o in outcomes if not isinstance(o, str)}
+    taken = set(conn.execute(select(table.c.slug).where(table.c.slug.in_(slugs))).scalars())
+    now = datetime.now(UTC)
+    results: list[BlogImportResult] = []
+    rows: list[dict[str, Any]] = []
+    for url, outcome in zip(urls, outcomes, strict=True):
+        if isinstance(outcome, str):
+            results.append(BlogImportResult(url=url, ok=False, error=outcome))
+            continue
+        title, summary, content, published = outcome
+        slug = _slugify(title)
+        if slug in taken:
+            results.append(BlogImportResult(url=url, ok=False, error="Slug already exists"))
+            continue
+        taken.add(slug)
+        rows.append({
+            "slug": slug,
+            "title": title,
+            "summary": summary,
+            "content": content,
+            "tags": tags,
+            "created_at": published or now,
+            **render_markdown(content),
+        })
+        results.append(BlogImportResult(url=url, ok=True, slug=slug))
+    if not rows:
+        return results, None
+    conn.execute(table.insert(), rows)
+    _adjust_tag_counts(conn, added=tags * len(rows))
+    return results, _bump_stats(conn, total_delta=len(rows))
+
+
+@router.post("/import/batch", response_model=BlogImportBatchResponse)
+async def import_posts_batch(payload: BlogImportBatchRequest) -> BlogImportBatchResponse:
+    """
+    Import many Medium/Substack URLs: fetched concurrently (bounded per host by
+    settings.import_per_host_concurrency), then inserted in one transaction.
+    """
+    per_host = get_settings().import_per_host_concurrency
+    host_limits: dict[str, asyncio.Semaphore] = {}
+    urls = list(dict.fromkeys(str(u) for u in payload.urls))
+
+    async def fetch(client: httpx.AsyncClient, url: str) -> _Article | str:
+        host = (urlparse(url).netloc or "").lower()
+        async with host_limits.setdefault(host, asyncio.Semaphore(per_host)):
+            try:
+                return await _fetch_and_parse_article(client, url)
+            except httpx.HTTPError as e:
+                return f"Could not fetch URL: {e!s}"
+            except ValueError as e:
+                return str(e)
+            except Exception as e:
+                # One bad page (parser crash, worker died) must not fail the other URLs
+                logger.warning("import of %s failed", url, exc_info=True)
+                return f"Import failed: {type(e).__name__}"
+
+    client = http_clients.web()
+    outcomes = await asyncio.gather(*(fetch(client, url) for url in urls))
+    results, version = await _run(_insert_imported, urls, list(outcomes), payload.tags, write=True)
+    if version is not None:
+        await _after_write(version)
+    imported = sum(r.ok for r in results)
+    return BlogImportBatchResponse(imported=imported, failed=len(results) - imported, results=results)
+
+
+class BlogSyncRequest(BaseModel):
+    newsletter: str = Field(..., pattern=r"^[A-Za-z0-9-]{1,100}$")  # <newsletter>.substack.com
+    tags: list[str] = []
+
+
+class BlogSyncResponse(BaseModel):
+    newsletter: str
+    changed: bool  # False: the feed answered 304, nothing was parsed
+    imported: int
+    failed: int
+    results: list[BlogImportResult]
+
+
+def _entry_guid(entry: Any) -> str:
+    return (entry.get("id") or entry.get("guid") or entry.get("link") or "").strip()
+
+
+def _read_sync_state(conn: Connection, newsletter: str) -> tuple[_SubstackFeed | None, str | None]:
+    """Persisted validators as an entry-less _SubstackFeed (for _feed_requests) plus the last GUID."""
+    sync = _get_feed_sync_table()
+    row = _first(conn, select(sync).where(sync.c.newsletter == newsletter))
+    if row is None:
+        return None, None
+    state = _SubstackFeed(feed_url=row["feed_url"], etag=row["etag"], last_modified=row["last_modified"])
+    return state, row["last_guid"]
+
+
+async def _unseen_articles(
+    feed: _SubstackFeed, last_guid: str | None
+) -> tuple[list[str], list[_Article | str]]:
+    """
+    Convert feed entries newer than last_guid (feeds list newest first) concurrently in the
+    import pool. Returns (links, outcomes).
+    """
+    unseen: list[int] = []
+    for position, entry in enumerate(feed.entries):
+        if last_guid and _entry_guid(entry) == last_guid:
+            break
+        unseen.append(position)
+
+    async def convert(position: int) -> _Article | str:
+        try:
+            article = await import_pool.run(_entry_to_article, feed.entries[position])
+        except ValueError as e:  # parse deadline
+            return str(e)
+        feed.articles[position] = article
+        return article or "Feed entry has no content"
+
+    outcomes = list(await asyncio.gather(*(convert(position) for position in unseen)))
+    links = [(feed.entries[p].get("link") or _entry_guid(feed.entries[p])).strip() for p in unseen]
+    return links, outcomes
+
+
+def _save_sync(
+    conn: Connection,
+    newsletter: str,
+    feed: _SubstackFeed,
+    links: list[str],
+    outcomes: list[_Article | str],
+    tags: list[str],
+) -> tuple[list[BlogImportResult], int | None]:
+    """Insert the new entries and record the feed validators and newest GUID, atomically."""
+    results, version = _insert_imported(conn, links, outcomes, tags)
+    sync = _get_feed_sync_table()
+    values = {
+        "feed_url": feed.feed_url,
+        "etag": feed.etag,
+        "last_modified": feed.last_modified,
+        "synced_at": datetime.now(UTC),
+    }
+    if feed.entries:
+        values["last_guid"] = _entry_guid(feed.entries[0])
+    insert = _dialect_insert(conn)
+    if insert is not None:
+        # Concurrent syncs of one newsletter can't both miss the row and collide on insert
+        stmt = insert(sync).values(newsletter=newsletter, **values)
+        conn.execute(stmt.on_conflict_do_update(index_elements=[sync.c.newsletter], set_=values))
+        return results, version
+    updated = conn.execute(sync.update().where(sync.c.newsletter == newsletter).values(**values))
+    if updated.rowcount == 0:
+        conn.execute(sync.insert().values(newsletter=newsletter, **values))
+    return results, version
+
+
+@router.post("/sync/substack", response_model=BlogSyncResponse)
+async def sync_substack(payload: BlogSyncRequest) -> BlogSyncResponse:
+    """
+    Pull new posts from a Substack newsletter feed. The feed is requested conditionally with
+    the stored validators, and only entries newer than the last synced GUID are converted.
+    """
+    newsletter = payload.newsletter.lower()
+    state, last_guid = await _run(_read_sync_state, newsletter)
+
+    feed = None
+    for feed_url, headers in _feed_requests(newsletter, state):
+        try:
+            feed = await _fetch_feed(http_clients.web(), state, feed_url, headers)
+        except (httpx.HTTPError, ValueError):
+            continue
+        if feed is not None:
+            break
+    if feed is None:
+        raise HTTPException(status_code=502, detail=f"Could not fetch the {newsletter} feed")
+    if feed is state:
+        return BlogSyncResponse(newsletter=newsletter, changed=False, imported=0, failed=0, results=[])
+
+    _remember_feed(newsletter, feed)  # single-URL imports reuse the fresh index
+    links, outcomes = await _unseen_articles(feed, last_guid)
+    results, version = await _run(_save_sync, newsletter, feed, links, outcomes, payload.tags, write=True)
+    if version is not None:
+        await _after_write(version)
+    imported = sum(r.ok for r in results)
+    return BlogSyncResponse(
+        newsletter=newsletter, changed=True, imported=imported, failed=len(results) - imported, results=results
+    )
 
-    engine = _get_engine()
+
+@router.get("/{slug}", response_model=BlogPost)
+async def get_post(
+    slug: str,
+    request: Request,
+    response: Response,
+    format: Literal["markdown", "html"] = Query("markdown", description="html adds the pre-rendered content_html"),
+) -> Response | BlogPost:
+    # The collection version also validates single posts: any write invalidates them all.
+    # Read it before the post so the ETag can never claim newer content than was served.
+    if _is_admin(request):
+        response.headers["Cache-Control"] = _PRIVATE_CACHE_CONTROL
+        return await _read_post(slug, include_html=format == "html", include_drafts=True)
+    etag = _etag(await _collection_version())
+    if _not_modified(request, etag, None):
+        return _not_modified_response(etag, None)
+    # Hits send the stored bytes; the entry keeps the ETag it was rendered under
+    user_hint = _user_cache_hint(request)
+    key = await cache_svc.acache_key("blog:post", slug, format, user_hint=user_hint)
+    cached = await cache_svc.aget_response(key)
+    if cached is None:
+        post = await _read_post(slug, include_html=format == "html")
+        cached = cache_svc.encode_response(post.model_dump(), {"ETag": etag})
+        await cache_svc.aset_response(key, cached, 300 if user_hint else 60)
+    return _send_cached(request, cached)
+
+
+def _post_from_row(row: Any, include_html: bool = False) -> BlogPost:
+    return BlogPost(
+        **{
+            **row,
+            "created_at": row["created_at"].isoformat() if row["created_at"] else "",
+            "content_html": row["content_html"] if include_html else None,
+            "toc": row["toc"] or [],
+            "tags": row["tags"] or [],
+            "published": row["published"] is not False,
+        }
+    )
+
+
+async def _read_post(slug: str, include_html: bool = False, include_drafts: bool = False) -> BlogPost:
+    """One post by slug. Public reads see published posts only; get_post caches their encoded response."""
     table = _get_table()
-    with engine.connect() as conn:
-        row = conn.execute(table.select().where(table.c.slug == slug)).mappings().first()
-        if not row:
-            raise HTTPException(status_code=404, detail="Post not found")
-        post = BlogPost(**{**row, "created_at": row["created_at"].isoformat() if row["created_at"] else ""})
-    cache_svc.set_cached(key, post.model_dump(), ttl)
-    return post
+    query = table.select().where(table.c.slug == slug)
+    if not include_drafts:
+        query = query.where(table.c.published)
+    row = await _run(_first, query)
+    if not row:
+        raise HTTPException(status_code=404, detail="Post not found")
+    return _post_from_row(row, include_html=include_html)
 
 
-@router.post("/", response_model=BlogPost)
-def create_post(payload: BlogPostCreate, request: Request) -> BlogPost:
-    engine = _get_engine()
+async def _after_write(version: int) -> None:
+    """Publish the committed version and drop cached blog responses."""
+    await _publish_version(version)
+    await cache_svc.ainvalidate_namespace("blog")
+
+
+def _insert_post(conn: Connection, slug: str, payload: BlogPostCreate) -> int:
     table = _get_table()
+    exists = conn.execute(table.select().where(table.c.slug == slug)).first()
+    if exists:
+        raise HTTPException(status_code=400, detail="Slug already exists")
+    tags = _normalize_tags(payload.tags)
+    conn.execute(table.insert().values(
+        slug=slug,
+        title=payload.title,
+        summary=payload.summary,
+        content=payload.content,
+        tags=tags,
+        published=payload.published,
+        **render_markdown(payload.content),
+        # Explicit timestamp (not the second-resolution server default) keeps
+        # (created_at, slug) keyset comparisons exact on every backend
+        created_at=datetime.now(UTC),
+    ))
+    if not payload.published:
+        return _bump_stats(conn)
+    _adjust_tag_counts(conn, added=tags)
+    return _bump_stats(conn, total_delta=1)
+
+
+@router.post("/", response_model=BlogPost)
+async def create_post(payload: BlogPostCreate, request: Request) -> BlogPost:
+    if not payload.published:
+        _require_admin_for_drafts(request)
     slug = _slugify(payload.title)
-    with engine.begin() as conn:
-        exists = conn.execute(table.select().where(table.c.slug == slug)).first()
-        if exists:
-            raise HTTPException(status_code=400, detail="Slug already exists")
-        conn.execute(table.insert().values(
-            slug=slug,
-            title=payload.title,
-            summary=payload.summary,
-            content=payload.content,
-        ))
-    cache_svc.invalidate_pattern("blog:")
-    return get_post(slug, request)
-def update_post(slug: str, payload: BlogPostUpdate, request: Request | None = None) -> BlogPost:
-    engine = _get_engine()
-    table = _get_table()
-    with engine.begin() as conn:
-        row = conn.execute(table.select().where(table.c.slug == slug)).first()
-        if not row:
-            raise HTTPException(status_code=404, detail="Post not found")
-        update_values = {}
-        if payload.title is not None:
-            update_values["title"] = payload.title
-        if payload.summary is not None:
-            update_values["summary"] = payload.summary
-        if payload.content is not None:
-            update_values["content"] = payload.content
-        if update_values:
-            conn.execute(table.update().where(table.c.slug == slug).values(**update_values))
-    cache_svc.invalidate_pattern("blog:")
-    return get_post(slug, request)
+    version = await _run(_insert_post, slug, payload, write=True)
+    await _after_write(version)
+    # The admin gets their draft back; anyone else only ever wrote a published post
+    return await _read_post(slug, include_drafts=not payload.published)
 
 
-@router.delete("/{slug}", response_model=dict)
-def delete_post(slug: str) -> dict:
-    engine = _get_engine()
+def _update_post(conn: Connection, slug: str, payload: BlogPostUpdate, admin: bool) -> int | None:
     table = _get_table()
-    with engine.begin() as conn:
-        exists = conn.execute(select(table.c.slug).where(table.c.slug == slug)).first()
-        if not exists:
-            raise HTTPException(status_code=404, detail="Post not found")
-        conn.execute(table.delete().where(table.c.slug == slug))
-    cache_svc.invalidate_pattern("blog:")
-    return {"ok": True}
+    row = conn.execute(table.select().where(table.c.slug == slug)).first()
+    # Non-admins can't see drafts, so they can't edit them either
+    if not row or (row.published is False and not admin):
+        raise HTTPException(status_code=404, detail="Post not found")
+    if payload.published is False and not admin:
+        raise HTTPException(status_code=403, detail="Drafts require the admin token")
+    update_values = {}
+    if payload.title is not None:
+        update_values["title"] = payload.title
+    if payload.summary is not None:
+        update_values["summary"] = payload.summary
+    if payload.content is not None:
+        update_values["content"] = payload.content
+        update_values.update(render_markdown(payload.content))
+    if payload.tags is not None:
+        update_values["tags"] = _normalize_tags(payload.tags)
+    if payload.published is not None:
+        update_values["published"] = payload.published
+    if not update_values:
+        return None
+    conn.execute(table.update().where(table.c.slug == slug).values(**update_values))
+    # Counts track published posts: a draft's tags count from the moment it is published
+    was_published = row.published is not False
+    is_published = update_values.get("published", was_published)
+    old_tags = row.tags or []
+    new_tags = update_values.get("tags", old_tags)
+    _adjust_tag_counts(
+        conn,
+        added=new_tags if is_published else [],
+        removed=old_tags if was_published else [],
+    )
+    return _bump_stats(conn, total_delta=int(is_published) - int(was_published))
 
 
+@router.put("/{slug}", response_model=BlogPost)
+async def update_post(slug: str, payload: BlogPostUpdate, request: Request) -> BlogPost:
+    admin = _is_admin(request)
+    version = await _run(_update_post, slug, payload, admin, write=True)
+    if version is not None:
+        await _after_write(version)
+    return await _read_post(slug, include_drafts=admin)
 
 
+def _delete_post(conn: Connection, slug: str, admin: bool) -> int:
+    table = _get_table()
+    exists = conn.execute(
+        select(table.c.slug, table.c.tags, table.c.published).where(table.c.slug == slug)
+    ).first()
+    if not exists or (exists.published is False and not admin):
+        raise HTTPException(status_code=404, detail="Post not found")
+    conn.execute(table.delete().where(table.c.slug == slug))
+    if exists.published is False:
+        return _bump_stats(conn)
+    _adjust_tag_counts(conn, removed=exists.tags or [])
+    return _bump_stats(conn, total_delta=-1)
+
 
+@router.delete("/{slug}", response_model=dict)
+async def delete_post(slug: str, request: Request) -> dict:
+    version = await _run(_delete_post, slug, _is_admin(request), write=True)
+    await _after_write(version)
+    return {"ok": True}
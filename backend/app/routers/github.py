@@ -1,4 +1,6 @@
 import asyncio
+import logging
+import time
 from typing import Any
 
 import httpx
@@ -6,10 +8,11 @@ from fastapi import APIRouter, HTTPException, Query, Request
 
 from app.config import get_settings
 from app.services import cache as cache_svc
+from app.services import http_clients
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-GITHUB_API = "https://api.github.com"
+router = APIRouter()
 
 
 def _headers() -> dict[str, str]:
@@ -31,46 +34,283 @@ def _user_cache_hint(request: Request | None) -> str | None:
 	return None
 
 
+def _normalize(repos: list[dict[str, Any]]) -> list[dict[str, Any]]:
+	"""The subset of each repo the frontend needs."""
+	return [
+		{
+			"id": r.get("id"),
+			"name": r.get("name"),
+			"full_name": r.get("full_name"),
+			"html_url": r.get("html_url"),
+			"description": r.get("description"),
+			"language": r.get("language"),
+			"stargazers_count": r.get("stargazers_count"),
+			"forks_count": r.get("forks_count"),
+			"updated_at": r.get("updated_at"),
+			"topics": r.get("topics", []),
+		}
+		for r in repos
+	]
+
+
+class _RateLimit:
+	"""Last X-RateLimit-* values GitHub sent; one budget shared by every request using our token."""
+
+	remaining: int | None = None
+	reset: float = 0.0
+	blocked_until: float = 0.0  # secondary limit: GitHub's Retry-After, independent of the primary window
+
+
+def _record_rate_limit(resp: httpx.Response) -> None:
+	remaining = resp.headers.get("X-RateLimit-Remaining", "")
+	reset = resp.headers.get("X-RateLimit-Reset", "")
+	if remaining.isdigit():
+		_RateLimit.remaining = int(remaining)
+	if reset.isdigit():
+		_RateLimit.reset = float(reset)
+
+
+def _rate_limited(needed: int = 1) -> bool:
+	"""
+	True during a secondary-limit backoff, or when `needed` more calls would eat into the
+	reserve before the window resets.
+	"""
+	if time.time() < _RateLimit.blocked_until:
+		return True
+	if _RateLimit.remaining is None or time.time() >= _RateLimit.reset:
+		return False
+	return _RateLimit.remaining - needed < get_settings().github_rate_limit_reserve
+
+
+def _rate_limit_error() -> HTTPException:
+	# Our budget, not the visitor's permissions: never pass GitHub's 403 through
+	now = time.time()
+	until = _RateLimit.blocked_until if now < _RateLimit.blocked_until else _RateLimit.reset
+	retry_after = max(1, int(until - now))
+	return HTTPException(
+		status_code=503,
+		detail="GitHub rate limit reached, try again later",
+		headers={"Retry-After": str(retry_after)},
+	)
+
+
+def _upstream_error(resp: httpx.Response) -> HTTPException:
+	# GitHub's body can echo request details; only its status reaches our callers
+	return HTTPException(status_code=502, detail=f"GitHub request failed ({resp.status_code})")
+
+
+async def _get_page(
+	username: str, per_page: int, page: int, headers: dict[str, str] | None = None
+) -> httpx.Response:
+	if _rate_limited():
+		raise _rate_limit_error()
+	params = {"sort": "updated", "per_page": per_page, "page": page, "type": "owner"}
+	resp = await http_clients.github().get(
+		f"/users/{username}/repos", headers=headers or _headers(), params=params
+	)
+	_record_rate_limit(resp)
+	if resp.status_code in (403, 429):
+		retry_after = resp.headers.get("Retry-After", "")
+		if retry_after.isdigit():
+			# Secondary limit: back off for as long as GitHub asks, leaving the primary budget alone
+			_RateLimit.blocked_until = max(_RateLimit.blocked_until, time.time() + int(retry_after))
+			raise _rate_limit_error()
+		if resp.status_code == 429 or resp.headers.get("X-RateLimit-Remaining") == "0":
+			raise _rate_limit_error()
+		# Any other 403 (permissions, blocked repo) is an ordinary upstream error for the caller
+	return resp
+
+
+def _last_page(resp: httpx.Response) -> int:
+	"""Page count from the Link header (1 when there is no next page), capped by github_max_pages."""
+	last = resp.links.get("last", {}).get("url")
+	page = httpx.URL(last).params.get("page", "1") if last else "1"
+	return min(int(page), get_settings().github_max_pages) if page.isdigit() else 1
+
+
+async def _remaining_pages(username: str, per_page: int, last: int) -> list[dict[str, Any]]:
+	"""Pages 2..last fetched concurrently, in order."""
+	if last <= 1:
+		return []
+	if _rate_limited(needed=last - 1):
+		raise _rate_limit_error()
+	responses = await asyncio.gather(*(_get_page(username, per_page, n) for n in range(2, last + 1)))
+	repos: list[dict[str, Any]] = []
+	for resp in responses:
+		if resp.status_code != 200:
+			raise _upstream_error(resp)
+		repos.extend(resp.json())
+	return repos
+
+
+# Cached entry: {"status", "fetched_at", "repos", "etag", "last_modified"}, or status 404 with "detail".
+# At most one refresh per key runs at a time.
+_REFRESHES: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+
+def _conditional_headers(previous: dict[str, Any] | None) -> dict[str, str]:
+	"""GitHub's 304s don't count against the rate limit, so revalidate whenever we hold validators."""
+	headers = _headers()
+	if previous and previous.get("etag"):
+		headers["If-None-Match"] = previous["etag"]
+	if previous and previous.get("last_modified"):
+		headers["If-Modified-Since"] = previous["last_modified"]
+	return headers
+
+
+async def _fetch_repos(
+	key: str, username: str, per_page: int, page: int | None, previous: dict[str, Any] | None
+) -> dict[str, Any]:
+	"""
+	One upstream read (every page when page is None), stored in the cache. 404s are kept
+	briefly so unknown users stay cheap. Raises 503 instead of spending the rate-limit reserve.
+	"""
+	settings = get_settings()
+	resp = await _get_page(username, per_page, page or 1, _conditional_headers(previous))
+	if resp.status_code == 304 and previous is not None:
+		# Unchanged: keep the stored list and validators, restart its freshness window. In "all"
+		# mode only page 1 is revalidated; repos are sorted by update time, so any change shows there.
+		entry = {**previous, "fetched_at": time.time()}
+		keep = settings.github_stale_ttl
+	elif resp.status_code == 200:
+		repos = resp.json()
+		if page is None:
+			repos += await _remaining_pages(username, per_page, _last_page(resp))
+		entry = {
+			"status": 200,
+			"fetched_at": time.time(),
+			"repos": _normalize(repos),
+			"etag": resp.headers.get("ETag"),
+			"last_modified": resp.headers.get("Last-Modified"),
+		}
+		keep = settings.github_stale_ttl
+	elif resp.status_code == 404:
+		entry = {"status": 404, "fetched_at": time.time(), "detail": "GitHub user not found"}
+		keep = settings.github_negative_ttl
+	else:
+		raise _upstream_error(resp)
+	await cache_svc.aset_cached(key, entry, keep)
+	return entry
+
+
+def _refresh(
+	key: str, username: str, per_page: int, page: int | None, previous: dict[str, Any] | None = None
+) -> asyncio.Task[dict[str, Any]]:
+	"""Start a refresh of key, or join the one already running (singleflight)."""
+	task = _REFRESHES.get(key)
+	if task is None:
+		task = asyncio.create_task(_fetch_repos(key, username, per_page, page, previous))
+		_REFRESHES[key] = task
+
+		def _done(t: asyncio.Task[dict[str, Any]]) -> None:
+			_REFRESHES.pop(key, None)
+			if not t.cancelled():
+				t.exception()  # a failed or rate-limited background refresh leaves the stale entry in place
+
+		task.add_done_callback(_done)
+	return task
+
+
+def _respond(entry: dict[str, Any]) -> list[dict[str, Any]]:
+	if entry["status"] == 404:
+		raise HTTPException(status_code=404, detail=entry["detail"])
+	return entry["repos"]
+
+
+def _repos_key(
+	username: str, per_page: int, page: int, all_pages: bool, user_hint: str | None = None
+) -> tuple[str, int, int | None]:
+	"""(cache key, per_page, page to fetch or None for every page) for one list_repos variant."""
+	if all_pages:
+		return cache_svc.cache_key("github:repos", username, "all", user_hint=user_hint), 100, None
+	key = cache_svc.cache_key("github:repos", username, str(per_page), str(page), user_hint=user_hint)
+	return key, per_page, page
+
+
 @router.get("/repos")
 async def list_repos(
 	request: Request,
 	username: str = Query(..., description="GitHub username"),
 	per_page: int = Query(12, ge=1, le=100),
 	page: int = Query(1, ge=1),
+	all_pages: bool = Query(False, alias="all", description="Every repo in one response; ignores per_page/page"),
 ) -> list[dict[str, Any]]:
 	user_hint = _user_cache_hint(request)
-	key = cache_svc.cache_key("github:repos", username, str(per_page), str(page), user_hint=user_hint)
-	ttl = 600 if user_hint else 300
-	cached = await asyncio.to_thread(cache_svc.get_cached, key)
-	if cached is not None:
-		return cached
+	key, per_page, fetch_page = _repos_key(username, per_page, page, all_pages, user_hint)
+	fresh_for = 600 if user_hint else 300
+	cached = await cache_svc.aget_cached(key)
+	if isinstance(cached, dict) and "fetched_at" in cached:
+		if time.time() - cached["fetched_at"] >= fresh_for and not _rate_limited():
+			# Stale: answer now, refresh in the background
+			_refresh(key, username, per_page, fetch_page, previous=cached)
+		return _respond(cached)
+	# Miss: concurrent callers share one upstream call; shield so a disconnect doesn't cancel it for the rest
+	return _respond(await asyncio.shield(_refresh(key, username, per_page, fetch_page)))
+
+
+def _warm_targets() -> list[tuple[str, int, bool]]:
+	"""
+	Parse settings.github_warm ("octocat,octocat:30,octocat:all") into (username, per_page, all).
+	Malformed entries are skipped with a warning rather than failing startup.
+	"""
+	targets = []
+	for entry in get_settings().github_warm.split(","):
+		username, _, size = entry.strip().partition(":")
+		if not username:
+			continue
+		if size in ("", "all"):
+			targets.append((username, 12, size == "all"))
+		elif size.isdigit() and 1 <= int(size) <= 100:
+			targets.append((username, int(size), False))
+		else:
+			logger.warning("ignoring GITHUB_WARM entry %r: size must be 1-100 or 'all'", entry.strip())
+	return targets
+
+
+async def warm_cache() -> None:
+	"""Refresh page 1 of every configured public list; revalidation makes unchanged lists nearly free."""
+	targets = [
+		(username, *_repos_key(username, per_page, 1, all_pages))
+		for username, per_page, all_pages in _warm_targets()
+	]
+	entries = await cache_svc.aget_many([key for _, key, _, _ in targets])
+	for (username, key, per_page, fetch_page), cached in zip(targets, entries, strict=True):
+		previous = cached if isinstance(cached, dict) and "fetched_at" in cached else None
+		try:
+			await _refresh(key, username, per_page, fetch_page, previous)
+		except (HTTPException, httpx.HTTPError):
+			pass  # rate limited or GitHub down: keep serving what is cached, retry next round
+		except Exception:
+			logger.exception("warming GitHub repos for %s failed", username)
+
+
+class _Warmup:
+	task: asyncio.Task[None] | None = None
+
+
+async def _warm_forever() -> None:
+	interval = get_settings().github_warm_interval
+	while True:
+		try:
+			await warm_cache()
+		except Exception:
+			# e.g. the cache backend is down: one bad round must not end the warm-up for good
+			logger.exception("GitHub warm-up round failed")
+		await asyncio.sleep(interval)
 
-	url = f"{GITHUB_API}/users/{username}/repos"
-	params = {"sort": "updated", "per_page": per_page, "page": page, "type": "owner"}
-	async with httpx.AsyncClient(timeout=15.0) as client:
-		resp = await client.get(url, headers=_headers(), params=params)
-		if resp.status_code != 200:
-			raise HTTPException(status_code=resp.status_code, detail=resp.text)
-		repos = resp.json()
 
-		# Normalize the subset we need
-		result: list[dict[str, Any]] = []
-		for r in repos:
-			result.append(
-				{
-					"id": r.get("id"),
-					"name": r.get("name"),
-					"full_name": r.get("full_name"),
-					"html_url": r.get("html_url"),
-					"description": r.get("description"),
-					"language": r.get("language"),
-					"stargazers_count": r.get("stargazers_count"),
-					"forks_count": r.get("forks_count"),
-					"updated_at": r.get("updated_at"),
-					"topics": r.get("topics", []),
-				}
-			)
-		await asyncio.to_thread(cache_svc.set_cached, key, result, ttl)
-		return result
+def start_warmup() -> None:
+	"""Start the periodic warm-up when GITHUB_WARM lists usernames. Called from app lifespan."""
+	if _warm_targets() and _Warmup.task is None:
+		_Warmup.task = asyncio.create_task(_warm_forever())
 
 
+async def stop_warmup() -> None:
+	"""Cancel the warm-up task. Called from app lifespan on shutdown."""
+	task, _Warmup.task = _Warmup.task, None
+	if task is not None:
+		task.cancel()
+		try:
+			await task
+		except asyncio.CancelledError:
+			pass
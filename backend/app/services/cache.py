@@ -1,15 +1,33 @@
-"""Optional Redis cache layer for GET endpoints. Speeds up responses for all users; when auth exists, can scope by user for longer TTL."""
+"""
+Optional Redis cache layer for GET endpoints. Speeds up responses for all users; when auth exists, can scope by user for longer TTL.
+
+While started (app lifespan, Redis configured), a bounded in-process LRU sits in front of Redis so hot keys
+cost a dict lookup instead of a round trip. Writes and invalidate_pattern() are broadcast over Redis pub/sub
+so every worker drops its local copies. Values served from the local tier are shared: treat them as read-only.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import gzip
 import hashlib
 import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 _REDIS: Any = None
 _KEY_PREFIX = "portfolio:"
+_INVALIDATE_CHANNEL = _KEY_PREFIX + "invalidate"
+_WORKER_ID = uuid.uuid4().hex  # lets a worker skip its own broadcasts
 
 
 def _get_redis():
@@ -32,41 +50,235 @@ def _get_redis():
         return None
 
 
+class _Async:
+    """redis.asyncio clients (text, and binary for response bytes); their pools belong to the loop that made them."""
+
+    clients: dict[bool, Any] = {}
+    loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_aredis(binary: bool = False):
+    """Lazy async Redis client for the running loop. Returns None if REDIS_URL not set."""
+    settings = get_settings()
+    if not settings.redis_url:
+        return None
+    loop = asyncio.get_running_loop()
+    if _Async.loop is not loop:
+        _Async.clients, _Async.loop = {}, loop
+    if binary in _Async.clients:
+        return _Async.clients[binary]
+    try:
+        import redis.asyncio
+        client = redis.asyncio.from_url(
+            settings.redis_url,
+            decode_responses=not binary,
+            socket_connect_timeout=2,
+            max_connections=settings.redis_max_connections,
+        )
+        _Async.clients[binary] = client
+        return client
+    except Exception:
+        return None
+
+
+class _Local:
+    """In-process tier: key -> (expires_at, size in bytes of its JSON, value), least recently used first."""
+
+    entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+    size = 0
+    lock = threading.Lock()  # callers run in the threadpool; the pub/sub listener has its own thread
+    listener: Any = None  # redis PubSubWorkerThread; the local tier is only used while it runs
+
+
+def _local_get(key: str) -> Any | None:
+    with _Local.lock:
+        entry = _Local.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _local_pop(key)
+            return None
+        _Local.entries.move_to_end(key)
+        return entry[2]
+
+
+def _local_set(key: str, value: Any, size: int, ttl_seconds: float) -> None:
+    settings = get_settings()
+    if size > settings.cache_local_max_bytes:
+        return
+    # Capped so a missed pub/sub message can only leave a copy stale for cache_local_ttl
+    expires_at = time.monotonic() + min(ttl_seconds, settings.cache_local_ttl)
+    with _Local.lock:
+        _local_pop(key)
+        _Local.entries[key] = (expires_at, size, value)
+        _Local.size += size
+        while (
+            len(_Local.entries) > settings.cache_local_max_entries
+            or _Local.size > settings.cache_local_max_bytes
+        ):
+            _local_pop(next(iter(_Local.entries)))
+
+
+def _local_pop(key: str) -> None:
+    """Drop one key. Caller holds _Local.lock."""
+    entry = _Local.entries.pop(key, None)
+    if entry is not None:
+        _Local.size -= entry[1]
+
+
+def _local_invalidate(prefix: str) -> None:
+    """Drop local keys starting with prefix (a full key drops itself)."""
+    with _Local.lock:
+        for key in [k for k in _Local.entries if k.startswith(prefix)]:
+            _local_pop(key)
+
+
+def _local_clear() -> None:
+    with _Local.lock:
+        _Local.entries.clear()
+        _Local.size = 0
+
+
+def _broadcast(r: Any, prefix: str) -> None:
+    r.publish(_INVALIDATE_CHANNEL, f"{_WORKER_ID} {prefix}")
+
+
+def _on_invalidate(message: dict[str, Any]) -> None:
+    sender, _, prefix = str(message["data"]).partition(" ")
+    if sender == _WORKER_ID:
+        return
+    if prefix.startswith(_GEN_PREFIX):
+        _Generations.values.pop(prefix.removeprefix(_GEN_PREFIX), None)
+    else:
+        _local_invalidate(prefix)
+
+
+def _on_listener_error(error: BaseException, pubsub: Any, thread: Any) -> None:
+    # Invalidations may have been missed while disconnected, so nothing local can be trusted
+    _local_clear()
+    _Generations.values.clear()
+    time.sleep(1.0)
+
+
+def start() -> None:
+    """Enable the local tier and subscribe to invalidations. Called from app lifespan; no-op without Redis."""
+    r = _get_redis()
+    if not r or _Local.listener is not None or get_settings().cache_local_max_entries <= 0:
+        return
+    try:
+        pubsub = r.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{_INVALIDATE_CHANNEL: _on_invalidate})
+        _Local.listener = pubsub.run_in_thread(
+            sleep_time=1.0, daemon=True, exception_handler=_on_listener_error
+        )
+    except Exception:
+        _Local.listener = None
+
+
+async def stop() -> None:
+    """Stop listening, drop the local tier and close the async pool. Called from app lifespan on shutdown."""
+    listener, _Local.listener = _Local.listener, None
+    if listener is not None:
+        listener.stop()
+    _local_clear()
+    clients, _Async.clients, _Async.loop = _Async.clients, {}, None
+    for client in clients.values():
+        await client.aclose()
+
+
 def cache_key(prefix: str, *parts: str, user_hint: str | None = None) -> str:
     """Build a cache key. Include user_hint when request is from a signed-in user (e.g. session id hash)."""
-    key = ":".join((_KEY_PREFIX, prefix) + tuple(parts))
+    key = _KEY_PREFIX + ":".join((prefix, *parts))
     if user_hint:
         key += ":" + hashlib.sha256(user_hint.encode()).hexdigest()[:16]
     return key
 
 
-def get_cached(key: str) -> Any | None:
-    """Return cached JSON value or None if miss or Redis unavailable."""
+def _local_many(keys: list[str]) -> tuple[list[Any | None], list[int]]:
+    """Values the local tier already holds, and the indexes of keys still to read from Redis."""
+    local = _Local.listener is not None
+    results = [_local_get(key) if local else None for key in keys]
+    return results, [i for i, value in enumerate(results) if value is None]
+
+
+def _queue_get(pipe: Any, keys: list[str]) -> None:
+    pipe.mget(keys)
+    if _Local.listener is not None:
+        # Remaining TTLs ride along in the same round trip so both tiers expire together
+        for key in keys:
+            pipe.ttl(key)
+
+
+def _apply_get(
+    keys: list[str], results: list[Any | None], missing: list[int], replies: list[Any]
+) -> list[Any | None]:
+    raws, ttls = replies[0], replies[1:] or [0] * len(missing)
+    for i, raw, ttl in zip(missing, raws, ttls, strict=True):
+        if raw is not None:
+            results[i] = json.loads(raw)
+            if ttl > 0:
+                _local_set(keys[i], results[i], len(raw), ttl)
+    return results
+
+
+def _queue_set(pipe: Any, items: dict[str, Any], ttl_seconds: int) -> list[tuple[str, str]]:
+    encoded = [(key, json.dumps(value, default=str)) for key, value in items.items()]
+    for key, raw in encoded:
+        pipe.setex(key, ttl_seconds, raw)
+        if _Local.listener is not None:
+            # Other workers may hold the old value
+            pipe.publish(_INVALIDATE_CHANNEL, f"{_WORKER_ID} {key}")
+    return encoded
+
+
+def _apply_set(encoded: list[tuple[str, str]], ttl_seconds: int) -> None:
+    if _Local.listener is not None:
+        # Keep the JSON round trip locally so both tiers hand out the same value
+        for key, raw in encoded:
+            _local_set(key, json.loads(raw), len(raw), ttl_seconds)
+
+
+def get_many(keys: list[str]) -> list[Any | None]:
+    """Cached JSON values for keys (None for misses): local tier first, the rest in one MGET round trip."""
+    results, missing = _local_many(keys)
     r = _get_redis()
-    if not r:
-        return None
+    if not missing or not r:
+        return results
     try:
-        raw = r.get(key)
-        if raw is None:
-            return None
-        return json.loads(raw)
+        pipe = r.pipeline(transaction=False)
+        _queue_get(pipe, [keys[i] for i in missing])
+        return _apply_get(keys, results, missing, pipe.execute())
     except Exception:
-        return None
+        return results
 
 
-def set_cached(key: str, value: Any, ttl_seconds: int) -> None:
-    """Store value in cache with TTL. No-op if Redis unavailable."""
+def set_many(items: dict[str, Any], ttl_seconds: int) -> None:
+    """Store several values with one TTL in a single pipelined round trip. No-op if Redis unavailable."""
     r = _get_redis()
-    if not r:
+    if not r or not items:
         return
     try:
-        r.setex(key, ttl_seconds, json.dumps(value, default=str))
+        pipe = r.pipeline(transaction=False)
+        encoded = _queue_set(pipe, items, ttl_seconds)
+        pipe.execute()
+        _apply_set(encoded, ttl_seconds)
     except Exception:
         pass
 
 
+def get_cached(key: str) -> Any | None:
+    """Return cached JSON value or None if miss or Redis unavailable. Local hits skip Redis."""
+    return get_many([key])[0]
+
+
+def set_cached(key: str, value: Any, ttl_seconds: int) -> None:
+    """Store value in cache with TTL. No-op if Redis unavailable."""
+    set_many({key: value}, ttl_seconds)
+
+
 def invalidate_pattern(prefix: str) -> None:
-    """Remove keys matching prefix (e.g. after blog post create/update). No-op if Redis unavailable."""
+    """Remove keys matching prefix (e.g. after blog post create/update), in every worker's local tier too."""
+    _local_invalidate(_KEY_PREFIX + prefix)
     r = _get_redis()
     if not r:
         return
@@ -75,5 +287,227 @@ def invalidate_pattern(prefix: str) -> None:
         keys = list(r.scan_iter(match=pattern, count=100))
         if keys:
             r.delete(*keys)
+        if _Local.listener is not None:
+            _broadcast(r, _KEY_PREFIX + prefix)
+    except Exception:
+        pass
+
+
+# Async API for async routes: same behaviour as the functions above, on redis.asyncio.
+# Local-tier hits return without awaiting I/O or touching the threadpool.
+
+
+async def aget_many(keys: list[str]) -> list[Any | None]:
+    """Async get_many."""
+    results, missing = _local_many(keys)
+    r = _get_aredis()
+    if not missing or not r:
+        return results
+    try:
+        pipe = r.pipeline(transaction=False)
+        _queue_get(pipe, [keys[i] for i in missing])
+        return _apply_get(keys, results, missing, await pipe.execute())
+    except Exception:
+        return results
+
+
+async def aset_many(items: dict[str, Any], ttl_seconds: int) -> None:
+    """Async set_many."""
+    r = _get_aredis()
+    if not r or not items:
+        return
+    try:
+        pipe = r.pipeline(transaction=False)
+        encoded = _queue_set(pipe, items, ttl_seconds)
+        await pipe.execute()
+        _apply_set(encoded, ttl_seconds)
+    except Exception:
+        pass
+
+
+async def aget_cached(key: str) -> Any | None:
+    """Async get_cached."""
+    return (await aget_many([key]))[0]
+
+
+async def aset_cached(key: str, value: Any, ttl_seconds: int) -> None:
+    """Async set_cached."""
+    await aset_many({key: value}, ttl_seconds)
+
+
+# Namespace generations: keys built by acache_key embed their namespace's current generation, so a
+# whole namespace is invalidated with one INCR and its old keys simply age out via their TTLs.
+
+_GEN_PREFIX = _KEY_PREFIX + "gen:"
+
+# A missing generation (never set, or evicted) starts from the clock in ms, so it can never fall back
+# to a value whose keys may still be cached. ARGV[2] == "1" bumps it.
+_GENERATION_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return tonumber(ARGV[1])
+end
+if ARGV[2] == '1' then
+    return redis.call('INCR', KEYS[1])
+end
+return tonumber(redis.call('GET', KEYS[1]))
+"""
+
+
+class _Generations:
+    """Process-local copies: namespace -> (generation, checked_at), trusted for cache_generation_ttl seconds."""
+
+    values: dict[str, tuple[int, float]] = {}
+
+
+async def _generation(namespace: str, bump: bool = False) -> int:
+    now = time.monotonic()
+    local = _Generations.values.get(namespace)
+    if not bump and local is not None and now - local[1] < get_settings().cache_generation_ttl:
+        return local[0]
+    generation = (local[0] if local else 0) + bump
+    r = _get_aredis()
+    if r:
+        try:
+            stored = await r.eval(_GENERATION_LUA, 1, _GEN_PREFIX + namespace, int(time.time() * 1000), int(bump))
+            generation = int(stored)
+        except Exception:
+            pass
+    _Generations.values[namespace] = (generation, now)
+    return generation
+
+
+async def acache_key(prefix: str, *parts: str, user_hint: str | None = None) -> str:
+    """cache_key with the namespace generation after the first prefix segment: blog:list -> blog:g42:list."""
+    namespace, _, rest = prefix.partition(":")
+    generation = await _generation(namespace)
+    return cache_key(":".join(filter(None, (namespace, f"g{generation}", rest))), *parts, user_hint=user_hint)
+
+
+async def ainvalidate_namespace(namespace: str) -> None:
+    """Invalidate every acache_key key in namespace with one INCR, however many keys exist."""
+    await _generation(namespace, bump=True)
+    r = _get_aredis()
+    if r and _Local.listener is not None:
+        try:
+            # Other workers re-read the generation now instead of after cache_generation_ttl
+            await r.publish(_INVALIDATE_CHANNEL, f"{_WORKER_ID} {_GEN_PREFIX + namespace}")
+        except Exception:
+            pass
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A response body exactly as sent (gzipped when encoding is set), with its media type and headers."""
+
+    body: bytes
+    media_type: str
+    headers: dict[str, str]
+    encoding: str | None = None
+
+    def pack(self) -> bytes:
+        meta = {"media_type": self.media_type, "headers": self.headers, "encoding": self.encoding}
+        return json.dumps(meta).encode() + b"\n" + self.body
+
+    @classmethod
+    def unpack(cls, raw: bytes) -> CachedResponse:
+        meta, _, body = raw.partition(b"\n")
+        return cls(body=body, **json.loads(meta))
+
+
+def encode_response(
+    content: Any, headers: dict[str, str], media_type: str = "application/json"
+) -> CachedResponse:
+    """Render content as JSONResponse would, gzipped once it reaches cache_compress_min_bytes."""
+    body = json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str).encode()
+    if len(body) >= get_settings().cache_compress_min_bytes:
+        return CachedResponse(gzip.compress(body, compresslevel=6, mtime=0), media_type, headers, "gzip")
+    return CachedResponse(body, media_type, headers)
+
+
+async def aget_response(key: str) -> CachedResponse | None:
+    """Cached response bytes, or None on a miss. Local hits skip Redis."""
+    local = _Local.listener is not None
+    if local and isinstance(entry := _local_get(key), CachedResponse):
+        return entry
+    r = _get_aredis(binary=True)
+    if not r:
+        return None
+    try:
+        raw, ttl = await r.pipeline(transaction=False).get(key).ttl(key).execute()
+        if raw is None:
+            return None
+        entry = CachedResponse.unpack(raw)
+        if local and ttl > 0:
+            _local_set(key, entry, len(raw), ttl)
+        return entry
+    except Exception:
+        return None
+
+
+async def aset_response(key: str, entry: CachedResponse, ttl_seconds: int) -> None:
+    """Store response bytes with TTL. No-op if Redis unavailable."""
+    r = _get_aredis(binary=True)
+    if not r:
+        return
+    try:
+        raw = entry.pack()
+        pipe = r.pipeline(transaction=False).setex(key, ttl_seconds, raw)
+        if _Local.listener is not None:
+            pipe.publish(_INVALIDATE_CHANNEL, f"{_WORKER_ID} {key}")
+        await pipe.execute()
+        if _Local.listener is not None:
+            _local_set(key, entry, len(raw), ttl_seconds)
     except Exception:
         pass
+
+
+# Atomically raise a counter to ARGV[1] unless it already holds a higher value
+_RAISE_COUNTER_LUA = """
+local cur = tonumber(redis.call('GET', KEYS[1]) or '-1')
+local new = tonumber(ARGV[1])
+if new > cur then
+    redis.call('SET', KEYS[1], ARGV[1])
+    return new
+end
+return cur
+"""
+
+
+async def aget_counter(key: str) -> int | None:
+    """Return an integer counter, or None if missing or Redis unavailable."""
+    r = _get_aredis()
+    if not r:
+        return None
+    try:
+        raw = await r.get(key)
+        return int(raw) if raw is not None else None
+    except Exception:
+        return None
+
+
+async def araise_counter(key: str, value: int) -> None:
+    """Set a monotonic counter to value unless another worker already stored a higher one."""
+    r = _get_aredis()
+    if not r:
+        return
+    try:
+        await r.eval(_RAISE_COUNTER_LUA, 1, key, value)
+    except Exception:
+        pass
+
+
+def health() -> dict[str, Any]:
+    """Redis readiness: whether it is configured, reachable, and the PING round-trip time."""
+    if not get_settings().redis_url:
+        return {"configured": False, "ok": True}
+    r = _get_redis()
+    if not r:
+        return {"configured": True, "ok": False}
+    started = time.perf_counter()
+    try:
+        r.ping()
+    except Exception as e:
+        logger.warning("redis readiness check failed", exc_info=True)
+        return {"configured": True, "ok": False, "error": type(e).__name__}
+    return {"configured": True, "ok": True, "latency_ms": round(1000 * (time.perf_counter() - started), 3)}
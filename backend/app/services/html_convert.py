@@ -0,0 +1,63 @@
+"""Single-parse HTML to markdown conversion for blog imports. Uses lxml when installed."""
+
+from __future__ import annotations
+
+import re
+
+from bs4 import BeautifulSoup, Tag
+from markdownify import MarkdownConverter
+
+try:
+    import lxml  # noqa: F401
+
+    PARSER = "lxml"
+except ImportError:  # pure-Python fallback, several times slower on large pages
+    PARSER = "html.parser"
+
+SUMMARY_LENGTH = 300
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_WHITESPACE = re.compile(r"\s+")
+
+# Same options the import path has always passed to markdownify()
+_CONVERTER = MarkdownConverter(
+    heading_style="ATX",
+    strip=["script", "style"],
+    escape_asterisks=False,
+    escape_underscores=False,
+)
+
+
+def parse(html: str) -> BeautifulSoup:
+    """Parse a page or fragment once; every later step works on this tree."""
+    return BeautifulSoup(html, PARSER)
+
+
+def strip_tags(node: Tag, selector: str = "script, style") -> None:
+    for tag in node.select(selector):
+        tag.decompose()
+
+
+def to_markdown(node: Tag) -> str:
+    """Markdown for a parsed node, converted in place rather than from re-serialized HTML."""
+    return _BLANK_LINES.sub("\n\n", _CONVERTER.convert_soup(node)).strip()
+
+
+def summarize(node: Tag, fallback: str = "") -> str:
+    """First SUMMARY_LENGTH characters of the node's text, or fallback[:200] when it has none."""
+    plain = _WHITESPACE.sub(" ", node.get_text(separator=" ", strip=True))
+    if len(plain) > SUMMARY_LENGTH:
+        return plain[: SUMMARY_LENGTH - 3] + "..."
+    return plain or fallback[:200]
+
+
+def convert(node: Tag, title: str = "") -> tuple[str, str]:
+    """(summary, markdown) from one tree. The summary is read first since conversion walks the same nodes."""
+    return summarize(node, title), to_markdown(node)
+
+
+def convert_fragment(html: str, title: str = "") -> tuple[str, str]:
+    """Parse an HTML fragment once, drop script/style, and return (summary, markdown)."""
+    soup = parse(html)
+    strip_tags(soup)
+    return convert(soup, title)
@@ -0,0 +1,159 @@
+"""
+Shared upstream HTTP clients (GitHub API, article/feed fetching), owned by the app lifespan.
+
+Connections are pooled and kept alive across requests. Idempotent requests are retried with
+exponential backoff on 429/5xx and connection errors, and a per-host circuit breaker fails
+fast (CircuitOpenError) after repeated failures instead of queueing on a dead upstream.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import random
+import time
+
+import httpx
+
+from app.config import get_settings
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_IDEMPOTENT = frozenset({"GET", "HEAD", "OPTIONS"})
+_MAX_RETRY_AFTER = 10.0  # never sleep longer than this for a Retry-After header
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting the host while its circuit is open."""
+
+
+class _Circuit:
+    """Consecutive-failure breaker for one host: open for a cooldown, then one trial request."""
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+
+    def allow(self, cooldown: float) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at < cooldown or self.trial_in_flight:
+            return False
+        self.trial_in_flight = True  # half-open
+        return True
+
+    def record(self, ok: bool, threshold: int) -> None:
+        self.trial_in_flight = False
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.failures >= threshold:
+            self.opened_at = time.monotonic()
+
+
+class _ResilientTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport with retries and per-host circuit breaking."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+        self._circuits: dict[str, _Circuit] = {}
+
+    def circuit(self, host: str) -> _Circuit:
+        return self._circuits.setdefault(host, _Circuit())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        settings = get_settings()
+        circuit = self.circuit(request.url.host)
+        if not circuit.allow(settings.http_circuit_cooldown):
+            raise CircuitOpenError(f"Circuit open for {request.url.host}", request=request)
+        trial = circuit.opened_at is not None  # an open circuit only lets its half-open trial through
+        try:
+            return await self._send(request, circuit)
+        finally:
+            # A cancelled or otherwise failed trial must not keep the host blocked forever
+            if trial:
+                circuit.trial_in_flight = False
+
+    async def _send(self, request: httpx.Request, circuit: _Circuit) -> httpx.Response:
+        settings = get_settings()
+        retries = settings.http_retries if request.method in _IDEMPOTENT else 0
+        attempt = 0
+        while True:
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    circuit.record(False, settings.http_circuit_failures)
+                    raise
+                delay = None
+            else:
+                if response.status_code not in _RETRY_STATUSES:
+                    circuit.record(True, settings.http_circuit_failures)
+                    return response
+                if attempt >= retries:
+                    # 429 means "slow down", not "down": it never opens the circuit
+                    circuit.record(response.status_code == 429, settings.http_circuit_failures)
+                    return response
+                delay = _retry_after(response)
+                await response.aclose()
+            attempt += 1
+            if delay is None:
+                delay = settings.http_backoff * 2 ** (attempt - 1) * (0.5 + random.random())
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    value = response.headers.get("retry-after", "")
+    return min(float(value), _MAX_RETRY_AFTER) if value.isdigit() else None
+
+
+def _new_client(**kwargs: object) -> httpx.AsyncClient:
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+    # HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+    http2 = settings.http2 and importlib.util.find_spec("h2") is not None
+    transport = _ResilientTransport(httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    return httpx.AsyncClient(transport=transport, **kwargs)
+
+
+class _Clients:
+    github: httpx.AsyncClient | None = None
+    web: httpx.AsyncClient | None = None
+
+
+def github() -> httpx.AsyncClient:
+    """Client for api.github.com."""
+    if _Clients.github is None:
+        _Clients.github = _new_client(base_url="https://api.github.com", timeout=15.0)
+    return _Clients.github
+
+
+def web() -> httpx.AsyncClient:
+    """Client for article pages and feeds (Medium, Substack, arbitrary blogs)."""
+    if _Clients.web is None:
+        _Clients.web = _new_client(follow_redirects=True, timeout=20.0)
+    return _Clients.web
+
+
+def start() -> None:
+    """Open the shared clients. Called from app lifespan."""
+    github()
+    web()
+
+
+async def close() -> None:
+    """Close the shared clients and their pooled connections. Called from app lifespan on shutdown."""
+    for client in (_Clients.github, _Clients.web):
+        if client is not None:
+            await client.aclose()
+    _Clients.github = None
+    _Clients.web = None
@@ -0,0 +1,82 @@
+"""Process pool for CPU-heavy article parsing, so imports never hold the API process's GIL."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import signal
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import get_settings
+
+# Extra wait past the in-worker deadline before a caller gives up on an unresponsive worker
+_DEADLINE_GRACE = 5.0
+
+
+class _Pool:
+    executor: ProcessPoolExecutor | None = None
+
+
+class _Deadline(BaseException):
+    """
+    Raised inside a worker when its parse outlives settings.import_parse_timeout. A
+    BaseException, so a parser's broad `except Exception` can't swallow it.
+    """
+
+
+def _raise_deadline(signum: int, frame: Any) -> None:
+    raise _Deadline
+
+
+def _call_with_deadline(timeout: float, fn: Callable[..., Any], *args: Any) -> Any:
+    """
+    Worker side: run fn, interrupted by SIGALRM after timeout seconds. Only that worker's
+    task fails; the process stays in the pool and other callers' work is untouched.
+    """
+    if not hasattr(signal, "setitimer"):  # Windows: only the caller-side timeout applies
+        return fn(*args)
+    signal.signal(signal.SIGALRM, _raise_deadline)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fn(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def start() -> None:
+    """Create the pool (workers spawn lazily on first use). Called from app lifespan."""
+    workers = get_settings().import_workers
+    if workers > 0 and _Pool.executor is None:
+        # spawn: forking a process that runs an event loop and DB pools is unsafe
+        _Pool.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def shutdown() -> None:
+    """Stop the pool, abandoning queued work. Called from app lifespan on shutdown."""
+    if _Pool.executor is not None:
+        _Pool.executor.shutdown(wait=False, cancel_futures=True)
+        _Pool.executor = None
+
+
+async def run[T](fn: Callable[..., T], *args: Any) -> T:
+    """
+    Run a picklable, module-level fn in the pool, bounded by settings.import_parse_timeout.
+    Falls back to the threadpool when IMPORT_WORKERS=0. Raises ValueError on timeout.
+
+    The deadline is enforced inside the worker, which interrupts the parse and moves on to
+    the next queued task. A worker stuck in C code that ignores it is waited on for
+    _DEADLINE_GRACE more seconds, then abandoned to finish on its own.
+    """
+    executor = _Pool.executor
+    if executor is None:
+        return await run_in_threadpool(fn, *args)
+    timeout = get_settings().import_parse_timeout
+    future = asyncio.get_running_loop().run_in_executor(executor, _call_with_deadline, timeout, fn, *args)
+    try:
+        return await asyncio.wait_for(future, timeout + _DEADLINE_GRACE)
+    except (_Deadline, TimeoutError):
+        raise ValueError(f"Parsing took longer than {timeout:g}s") from None
@@ -1,3 +1,4 @@
 from app.utils.ingredient_format import format_ingredient_display, ingredient_section_count
+from app.utils.markdown_render import render_markdown
 
-__all__ = ["format_ingredient_display", "ingredient_section_count"]
+__all__ = ["format_ingredient_display", "ingredient_section_count", "render_markdown"]
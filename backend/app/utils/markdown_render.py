@@ -0,0 +1,71 @@
+"""Render blog markdown once at write time: sanitized HTML, table of contents, and reading stats."""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any
+
+from markdown_it import MarkdownIt
+
+# Raw HTML is escaped (html=False) and markdown-it rejects javascript:/vbscript:/data: links,
+# so the output is safe to inject without a separate sanitizer pass.
+_MD = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+_WORD = re.compile(r"\w+(?:['’-]\w+)*")
+_ANCHOR_STRIP = re.compile(r"[^\w\s-]")
+_ANCHOR_SPACE = re.compile(r"[\s-]+")
+
+WORDS_PER_MINUTE = 200
+
+
+def _anchor(text: str, used: set[str]) -> str:
+    """GitHub-style heading anchor, suffixed (-1, -2, ...) when repeated."""
+    base = _ANCHOR_SPACE.sub("-", _ANCHOR_STRIP.sub("", text.lower())).strip("-") or "section"
+    anchor, n = base, 0
+    while anchor in used:
+        n += 1
+        anchor = f"{base}-{n}"
+    used.add(anchor)
+    return anchor
+
+
+def _inline_text(token: Any) -> str:
+    """Plain text of an inline token (emphasis, links, etc. flattened)."""
+    return "".join(
+        child.content for child in (token.children or []) if child.type in ("text", "code_inline")
+    )
+
+
+def reading_time_minutes(word_count: int) -> int:
+    """Whole minutes at WORDS_PER_MINUTE, at least 1 for any non-empty post."""
+    return math.ceil(word_count / WORDS_PER_MINUTE) if word_count else 0
+
+
+def render_markdown(content: str) -> dict[str, Any]:
+    """
+    Render post markdown to the precomputed columns stored with each post.
+
+    Returns {"content_html", "toc", "word_count", "reading_time"}; headings in the HTML
+    carry ids matching the toc entries ({"level", "text", "id"}).
+    """
+    tokens = _MD.parse(content or "")
+    toc: list[dict[str, Any]] = []
+    used: set[str] = set()
+    words = 0
+    for i, token in enumerate(tokens):
+        if token.type == "inline":
+            words += len(_WORD.findall(_inline_text(token)))
+        elif token.type in ("fence", "code_block"):
+            words += len(_WORD.findall(token.content))
+        elif token.type == "heading_open" and i + 1 < len(tokens):
+            text = _inline_text(tokens[i + 1]).strip()
+            anchor = _anchor(text, used)
+            token.attrSet("id", anchor)
+            toc.append({"level": int(token.tag[1]), "text": text, "id": anchor})
+    return {
+        "content_html": _MD.renderer.render(tokens, _MD.options, {}),
+        "toc": toc,
+        "word_count": words,
+        "reading_time": reading_time_minutes(words),
+    }
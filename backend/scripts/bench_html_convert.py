@@ -0,0 +1,108 @@
+"""
+Benchmark article import conversion on large synthetic pages.
+
+Compares the previous multi-parse path (parse page, serialize the article body, re-parse it
+for the summary, markdownify() parses it again) with app.services.html_convert, which parses
+once. Run from backend/:
+
+    python scripts/bench_html_convert.py [--sizes 1 2 5] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from markdownify import markdownify
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import html_convert  # noqa: E402
+
+_PARAGRAPH = (
+    "<p>Streaming systems trade <b>latency</b> for <i>throughput</i>; see "
+    '<a href="https://example.com/docs">the docs</a> and <code>checkpoint_interval</code>.</p>\n'
+)
+_SECTION = (
+    "<h2>Section</h2>\n" + _PARAGRAPH * 8
+    + "<pre><code>SELECT * FROM events WHERE ts &gt; now() - interval '1 hour';</code></pre>\n"
+    + "<ul><li>first</li><li>second</li><li>third</li></ul>\n"
+    + '<figure><img src="https://example.com/a.png" alt="diagram"><figcaption>Fig</figcaption></figure>\n'
+)
+
+
+def make_page(megabytes: float) -> str:
+    """An article page of roughly the given size with Medium-like chrome around it."""
+    target = int(megabytes * 1024 * 1024)
+    sections = max(1, target // len(_SECTION))
+    return (
+        "<!DOCTYPE html><html><head><title>Benchmark</title>"
+        '<meta property="og:title" content="Benchmark Article"></head><body>'
+        "<nav>menu</nav><header>site</header><article><h1>Benchmark Article</h1>"
+        + _SECTION * sections
+        + "<script>track()</script></article><footer>foot</footer></body></html>"
+    )
+
+
+def legacy_convert(html: str) -> tuple[str, str]:
+    """The pre-html_convert pipeline, kept here only for comparison."""
+    soup = BeautifulSoup(html, "html.parser")
+    article_body = soup.find("article")
+    for tag in article_body.select("script, style, nav, header, footer, .comments"):
+        tag.decompose()
+    content_html = str(article_body)
+    content_md = markdownify(
+        content_html,
+        heading_style="ATX",
+        strip=["script", "style"],
+        escape_asterisks=False,
+        escape_underscores=False,
+    )
+    content_md = re.sub(r"\n{3,}", "\n\n", content_md).strip()
+    plain = re.sub(r"\s+", " ", BeautifulSoup(content_html, "html.parser").get_text(separator=" ", strip=True))
+    summary = (plain[:297] + "...") if len(plain) > 300 else plain
+    return summary, content_md
+
+
+def single_parse_convert(html: str) -> tuple[str, str]:
+    soup = html_convert.parse(html)
+    article_body = soup.find("article")
+    html_convert.strip_tags(article_body, "script, style, nav, header, footer, .comments")
+    return html_convert.convert(article_body)
+
+
+def best_of(fn: Callable[[str], object], html: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(html)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 2, 5], help="page sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    parsers = ["html.parser"] + (["lxml"] if html_convert.PARSER == "lxml" else [])
+    print(f"{'size':>6}  {'legacy':>9}  " + "  ".join(f"{'single/' + p:>18}" for p in parsers))
+    for size in args.sizes:
+        html = make_page(size)
+        legacy = best_of(legacy_convert, html, args.repeat)
+        cells = []
+        for name in parsers:
+            html_convert.PARSER = name
+            elapsed = best_of(single_parse_convert, html, args.repeat)
+            cells.append(f"{elapsed:8.2f}s ({legacy / elapsed:4.1f}x)")
+        print(f"{size:>5.1f}M  {legacy:8.2f}s  " + "  ".join(f"{c:>18}" for c in cells))
+
+
+if __name__ == "__main__":
+    main()
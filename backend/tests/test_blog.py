@@ -1,7 +1,9 @@
+import json
 import os
 import sys
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
 import httpx
@@ -26,16 +28,38 @@ def client(tmp_path: Path) -> Iterator[TestClient]:
     db_path = tmp_path / "test.db"
     os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
     os.environ["SEED_BLOG"] = "false"
+    os.environ["IMPORT_WORKERS"] = "0"
     get_settings.cache_clear()
     # Reset module-level engine/table between tests
     blog_router.Db.engine = None
     blog_router.Db.table = None
+    blog_router._FEEDS.clear()
 
     app = create_app()
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture()
+def async_client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[TestClient]:
+    """Same app, but the blog router runs on SQLAlchemy's async engine (aiosqlite)."""
+    pytest.importorskip("aiosqlite")
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("DATABASE_ASYNC", "true")
+    monkeypatch.setenv("SEED_BLOG", "false")
+    monkeypatch.setenv("IMPORT_WORKERS", "0")
+    get_settings.cache_clear()
+    blog_router.Db.engine = None
+    blog_router.Db.async_engine = None
+    blog_router.Db.table = None
+    blog_router._FEEDS.clear()
+
+    app = create_app()
+    with TestClient(app) as client:
+        yield client
+    get_settings.cache_clear()
+
+
 def test_empty_list_and_headers(client: TestClient) -> None:
     res = client.get("/api/blog/?page=1&page_size=20")
     assert res.status_code == 200
@@ -83,6 +107,34 @@ def test_pagination(client: TestClient) -> None:
     assert len(page2.json()) == 1
 
 
+def test_cursor_pagination_matches_page_order(client: TestClient) -> None:
+    for i in range(1, 6):
+        payload = {"title": f"Post {i}", "summary": f"s{i}", "content": f"c{i}"}
+        assert client.post("/api/blog/", json=payload).status_code == 200
+
+    by_page = [p["slug"] for p in client.get("/api/blog/?page=1&page_size=50").json()]
+
+    seen: list[str] = []
+    res = client.get("/api/blog/?page_size=2")
+    while True:
+        assert res.status_code == 200
+        seen.extend(p["slug"] for p in res.json())
+        next_cursor = res.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        res = client.get(f"/api/blog/?page_size=2&cursor={next_cursor}")
+        assert res.headers.get("X-Total-Count") == "5"
+
+    assert seen == by_page
+    assert len(set(seen)) == 5
+
+
+def test_invalid_cursor_returns_400(client: TestClient) -> None:
+    res = client.get("/api/blog/?cursor=not-a-cursor")
+    assert res.status_code == 400
+    assert res.json()["detail"] == "Invalid cursor"
+
+
 def test_etag_last_modified_and_304(client: TestClient) -> None:
     # Seed one post
     payload = {"title": "Cache Test", "summary": "sum", "content": "content"}
@@ -109,6 +161,179 @@ def test_etag_last_modified_and_304(client: TestClient) -> None:
     assert third.headers.get("ETag") != etag
 
 
+def test_edit_changes_etag_and_stats_track_writes(client: TestClient) -> None:
+    payload = {"title": "Edit Me", "summary": "sum", "content": "v1"}
+    assert client.post("/api/blog/", json=payload).status_code == 200
+    etag = client.get("/api/blog/").headers["ETag"]
+
+    updated = client.put("/api/blog/edit-me", json={"content": "v2"})
+    assert updated.status_code == 200
+    assert updated.json()["content"] == "v2"
+
+    after_edit = client.get("/api/blog/", headers={"If-None-Match": etag})
+    assert after_edit.status_code == 200
+    assert after_edit.headers["ETag"] != etag
+    assert after_edit.headers["X-Total-Count"] == "1"
+
+    restore = [
+        {"slug": "a", "title": "A", "summary": "a", "content": "a"},
+        {"slug": "b", "title": "B", "summary": "b", "content": "b"},
+    ]
+    assert client.post("/api/blog/restore", json=restore).status_code == 200
+    assert client.get("/api/blog/").headers["X-Total-Count"] == "2"
+    assert client.delete("/api/blog/a").status_code == 200
+    assert client.get("/api/blog/").headers["X-Total-Count"] == "1"
+
+
+def test_revalidation_304_skips_database(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = {"title": "Hot Post", "summary": "sum", "content": "content"}
+    assert client.post("/api/blog/", json=payload).status_code == 200
+    list_etag = client.get("/api/blog/").headers["ETag"]
+    post_etag = client.get("/api/blog/hot-post").headers["ETag"]
+
+    def no_db() -> None:
+        raise AssertionError("database touched on revalidation")
+
+    monkeypatch.setattr(blog_router, "_get_engine", no_db)
+    assert client.get("/api/blog/", headers={"If-None-Match": list_etag}).status_code == 304
+    assert client.get("/api/blog/hot-post", headers={"If-None-Match": post_etag}).status_code == 304
+    monkeypatch.undo()
+
+    # Any write through the router changes the version for lists and posts alike
+    assert client.put("/api/blog/hot-post", json={"summary": "new"}).status_code == 200
+    assert client.get("/api/blog/", headers={"If-None-Match": list_etag}).status_code == 200
+    detail = client.get("/api/blog/hot-post", headers={"If-None-Match": post_etag})
+    assert detail.status_code == 200
+    assert detail.json()["summary"] == "new"
+
+
+def test_sync_engine_write_is_one_threadpool_hop(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    hops: list[str] = []
+    real = blog_router.run_in_threadpool
+
+    async def counting(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        hops.append(getattr(fn, "__name__", repr(fn)))
+        return await real(fn, *args, **kwargs)
+
+    monkeypatch.setattr(blog_router, "run_in_threadpool", counting)
+    assert client.post("/api/blog/", json={"title": "One Hop", "summary": "s", "content": "c"}).status_code == 200
+    # insert (connect + begin + write + commit + close), then the read-back: one hop each
+    assert hops == ["_run_unit", "_run_unit"]
+    monkeypatch.undo()
+    assert client.get("/api/blog/one-hop").json()["content"] == "c"
+
+
+def test_async_engine_crud_roundtrip(async_client: TestClient) -> None:
+    payload = {"title": "Async Post", "summary": "sum", "content": "v1"}
+    assert async_client.post("/api/blog/", json=payload).status_code == 200
+    assert async_client.put("/api/blog/async-post", json={"content": "v2"}).json()["content"] == "v2"
+
+    listed = async_client.get("/api/blog/")
+    assert [p["slug"] for p in listed.json()] == ["async-post"]
+    assert listed.headers["X-Total-Count"] == "1"
+    assert async_client.get("/api/blog/", headers={"If-None-Match": listed.headers["ETag"]}).status_code == 304
+
+    backup = async_client.get("/api/blog/backup").json()
+    assert async_client.delete("/api/blog/async-post").status_code == 200
+    assert async_client.get("/api/blog/async-post").status_code == 404
+    assert async_client.post("/api/blog/restore", json=backup).json() == {"ok": True, "count": 1}
+    assert async_client.get("/api/blog/async-post").json()["content"] == "v2"
+
+
+@pytest.mark.parametrize("fixture", ["client", "async_client"])
+def test_streaming_backup_formats(fixture: str, request: pytest.FixtureRequest) -> None:
+    client: TestClient = request.getfixturevalue(fixture)
+    titles = [f"Post {i}" for i in range(3)]
+    for title in titles:
+        client.post("/api/blog/", json={"title": title, "summary": "s", "content": "c"})
+    expected = client.get("/api/blog/backup").json()
+    assert [p["title"] for p in expected] == titles[::-1]
+
+    # Several batches, to cover the separators between them
+    request.getfixturevalue("monkeypatch").setattr(blog_router, "_BACKUP_BATCH_SIZE", 2)
+    as_json = client.get("/api/blog/backup", params={"format": "json"})
+    assert as_json.headers["content-type"] == "application/json"
+    assert as_json.json() == expected
+
+    ndjson = client.get("/api/blog/backup", params={"format": "ndjson", "gzip": "true"})
+    assert ndjson.headers["content-encoding"] == "gzip"
+    assert ndjson.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in ndjson.text.splitlines()] == expected
+
+
+def test_ndjson_restore_preserves_order_and_merges(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    for title in ("First", "Second", "Third"):
+        client.post("/api/blog/", json={"title": title, "summary": "s", "content": "c", "tags": ["x"]})
+    export = client.get("/api/blog/backup", params={"format": "ndjson"}).content
+
+    # Replace with a streamed upload split across batches: old created_at order survives
+    monkeypatch.setattr(blog_router, "_RESTORE_BATCH_SIZE", 2)
+    client.post("/api/blog/", json={"title": "Extra", "summary": "s", "content": "c"})
+    res = client.post("/api/blog/restore", content=export, headers={"Content-Type": "application/x-ndjson"})
+    assert res.json() == {"ok": True, "count": 3}
+    listed = client.get("/api/blog/")
+    assert [p["slug"] for p in listed.json()] == ["third", "second", "first"]
+    assert client.get("/api/blog/tags").json() == [{"tag": "x", "count": 3}]
+
+    # Merge upserts by slug and keeps everything else, including created_at when the upload omits it
+    first_created = client.get("/api/blog/first").json()["created_at"]
+    merge = [
+        {"slug": "first", "title": "First v2", "summary": "s", "content": "c"},
+        {"slug": "fourth", "title": "Fourth", "summary": "s", "content": "c", "created_at": "2000-01-01T00:00:00+00:00"},
+    ]
+    assert client.post("/api/blog/restore?mode=merge", json=merge).json()["count"] == 2
+    listed = client.get("/api/blog/")
+    assert listed.headers["X-Total-Count"] == "4"
+    assert listed.json()[-1]["slug"] == "fourth"
+    merged = client.get("/api/blog/first").json()
+    assert merged["title"] == "First v2"
+    assert merged["created_at"] == first_created
+
+    # A bad line rolls the whole restore back
+    bad = b'{"slug": "new", "title": "N", "summary": "s", "content": "c"}\n{"slug": "broken"}\n'
+    res = client.post("/api/blog/restore", content=bad, headers={"Content-Type": "application/x-ndjson"})
+    assert res.status_code == 422
+    assert client.get("/api/blog/").headers["X-Total-Count"] == "4"
+
+
+def test_large_responses_sent_gzipped_when_accepted(client: TestClient) -> None:
+    body = "Compressible paragraph. " * 200
+    assert client.post("/api/blog/", json={"title": "Long Read", "summary": "s", "content": body}).status_code == 200
+
+    gzipped = client.get("/api/blog/long-read", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in gzipped.headers["Vary"]
+    assert int(gzipped.headers["Content-Length"]) < len(body)
+    assert gzipped.json()["content"] == body
+    assert gzipped.headers["ETag"]
+
+    plain = client.get("/api/blog/long-read", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.json()["content"] == body
+
+    # Small bodies are stored and sent as-is
+    listed = client.get("/api/blog/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in listed.headers
+    assert listed.json()[0]["slug"] == "long-read"
+
+
+def test_render_artifacts_stored_on_write(client: TestClient) -> None:
+    payload = {"title": "Rendered", "summary": "s", "content": "# Top\n\nSome words here.\n\n## Part"}
+    created = client.post("/api/blog/", json=payload).json()
+    assert created["word_count"] == 5
+    assert created["reading_time"] == 1
+    assert [e["id"] for e in created["toc"]] == ["top", "part"]
+    assert created["content_html"] is None
+
+    html = client.get("/api/blog/rendered?format=html").json()["content_html"]
+    assert '<h1 id="top">Top</h1>' in html
+
+    client.put("/api/blog/rendered", json={"content": "Only *one* line"})
+    updated = client.get("/api/blog/rendered?format=html").json()
+    assert updated["toc"] == []
+    assert updated["content_html"] == "<p>Only <em>one</em> line</p>\n"
+
+
 def test_backup_and_delete(client: TestClient) -> None:
     payload = {"title": "Backup Me", "summary": "sum", "content": "full"}
     assert client.post("/api/blog/", json=payload).status_code == 200
@@ -848,3 +1073,362 @@ def test_delete_all_posts_empty_list(client: TestClient) -> None:
     final_list = client.get("/api/blog/?page_size=50")
     assert final_list.json() == []
     assert final_list.headers.get("X-Total-Count") == "0"
+
+
+def test_health_ready_reports_database_and_pool(client: TestClient) -> None:
+    assert client.get("/api/blog/").status_code == 200
+    res = client.get("/api/health/ready")
+    assert res.status_code == 200
+    body = res.json()
+    assert body["database"]["ok"] is True
+    assert body["database"]["latency_ms"] >= 0
+    pool = body["database"]["pool"]
+    assert pool["acquired"] >= 1
+    assert pool["checked_out"] == 0
+    assert "wait_max_ms" in pool
+    assert body["redis"] == {"configured": False, "ok": True}
+
+
+def test_health_ready_hides_database_error_details(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    def broken(conn: Any, query: Any) -> Any:
+        raise RuntimeError("password authentication failed for user admin@db.internal")
+
+    monkeypatch.setattr(blog_router, "_all", broken)
+    res = client.get("/api/health/ready")
+    assert res.status_code == 503
+    assert res.json()["database"]["error"] == "RuntimeError"
+    assert "password" not in res.text
+
+
+def test_search_ranks_and_highlights_matches(client: TestClient) -> None:
+    client.post("/api/blog/", json={"title": "Streaming joins", "summary": "Flink", "content": "Joining <b>streams</b> in Flink."})
+    client.post("/api/blog/", json={"title": "Cooking", "summary": "Dinner", "content": "A note on streaming recipes."})
+    client.post("/api/blog/", json={"title": "Unrelated", "summary": "x", "content": "nothing to see"})
+
+    res = client.get("/api/blog/search", params={"q": "stream"})
+    assert res.status_code == 200
+    assert res.headers["X-Total-Count"] == "2"
+    results = res.json()
+    # Title matches outweigh body matches
+    assert [r["slug"] for r in results] == ["streaming-joins", "cooking"]
+    assert "<mark>" in results[0]["snippet"]
+    assert "<b>" not in results[0]["snippet"]
+
+    # Index follows edits and deletes; FTS syntax in the query is inert
+    client.put("/api/blog/cooking", json={"content": "Plain dinner."})
+    client.delete("/api/blog/streaming-joins")
+    assert client.get("/api/blog/search", params={"q": 'stream" OR *'}).json() == []
+    assert client.get("/api/blog/search", params={"q": "dinner"}).headers["X-Total-Count"] == "1"
+
+
+def test_tag_filter_and_facet_counts(client: TestClient) -> None:
+    client.post("/api/blog/", json={"title": "A", "summary": "s", "content": "c", "tags": ["Kafka", " flink "]})
+    client.post("/api/blog/", json={"title": "B", "summary": "s", "content": "c", "tags": ["kafka"]})
+    client.post("/api/blog/", json={"title": "C", "summary": "s", "content": "c"})
+
+    assert client.get("/api/blog/a").json()["tags"] == ["kafka", "flink"]
+    res = client.get("/api/blog/", params={"tag": "kafka"})
+    assert [p["slug"] for p in res.json()] == ["b", "a"]
+    assert res.headers["X-Total-Count"] == "2"
+    assert client.get("/api/blog/tags").json() == [{"tag": "kafka", "count": 2}, {"tag": "flink", "count": 1}]
+
+    # Counts follow edits and deletes; unused tags disappear
+    client.put("/api/blog/b", json={"tags": ["iceberg"]})
+    client.delete("/api/blog/a")
+    assert client.get("/api/blog/tags").json() == [{"tag": "iceberg", "count": 1}]
+    res = client.get("/api/blog/", params={"tag": "kafka"})
+    assert res.json() == []
+    assert res.headers["X-Total-Count"] == "0"
+
+    # Restore recounts from scratch
+    backup = client.get("/api/blog/backup").json()
+    assert client.post("/api/blog/restore", json=backup).status_code == 200
+    assert client.get("/api/blog/tags").json() == [{"tag": "iceberg", "count": 1}]
+
+
+def test_adjust_tag_counts_upserts_in_one_statement(client: TestClient) -> None:
+    assert client.get("/api/blog/tags").json() == []
+    tag_counts = blog_router._get_tag_counts_table()
+    with blog_router._get_engine().begin() as conn:
+        blog_router._adjust_tag_counts(conn, added=["kafka"])
+        blog_router._adjust_tag_counts(conn, added=["kafka", "flink"], removed=["iceberg"])
+        blog_router._adjust_tag_counts(conn, removed=["flink"])
+        rows = dict(conn.execute(blog_router.select(tag_counts.c.tag, tag_counts.c.count)).all())
+    assert rows == {"kafka": 2}
+
+
+def test_drafts_hidden_from_public_reads(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BLOG_ADMIN_TOKEN", "s3cret")
+    get_settings.cache_clear()
+    admin = {"Authorization": "Bearer s3cret"}
+
+    client.post("/api/blog/", json={"title": "Live", "summary": "s", "content": "public words", "tags": ["t"]})
+    draft = {"title": "Draft", "summary": "s", "content": "secret words", "tags": ["t"], "published": False}
+    assert client.post("/api/blog/", json=draft).status_code == 403
+    created = client.post("/api/blog/", json=draft, headers=admin)
+    assert created.status_code == 200
+    assert created.json()["published"] is False
+
+    res = client.get("/api/blog/")
+    assert [p["slug"] for p in res.json()] == ["live"]
+    assert res.headers["X-Total-Count"] == "1"
+    assert client.get("/api/blog/draft").status_code == 404
+    assert client.get("/api/blog/search", params={"q": "words"}).headers["X-Total-Count"] == "1"
+    assert client.get("/api/blog/tags").json() == [{"tag": "t", "count": 1}]
+    assert [p["slug"] for p in client.get("/api/blog/backup").json()] == ["live"]
+
+    # Admin sees drafts, privately; a wrong token is just a public reader
+    res = client.get("/api/blog/", headers=admin)
+    assert [p["slug"] for p in res.json()] == ["draft", "live"]
+    assert res.headers["X-Total-Count"] == "2"
+    assert res.headers["Cache-Control"] == "private, no-store"
+    assert client.get("/api/blog/draft", headers=admin).json()["published"] is False
+    assert client.get("/api/blog/draft", headers={"Authorization": "Bearer nope"}).status_code == 404
+
+    # Non-admin writes can't reach drafts or unpublish posts
+    assert client.put("/api/blog/draft", json={"title": "Leak"}).status_code == 404
+    assert client.delete("/api/blog/draft").status_code == 404
+    assert client.put("/api/blog/live", json={"published": False}).status_code == 403
+
+    # Publishing makes it public and counts it
+    assert client.put("/api/blog/draft", json={"published": True}, headers=admin).status_code == 200
+    res = client.get("/api/blog/")
+    assert res.headers["X-Total-Count"] == "2"
+    assert client.get("/api/blog/tags").json() == [{"tag": "t", "count": 2}]
+    assert client.get("/api/blog/draft").status_code == 200
+
+
+def test_public_backup_restore_keeps_drafts(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BLOG_ADMIN_TOKEN", "s3cret")
+    get_settings.cache_clear()
+    admin = {"Authorization": "Bearer s3cret"}
+    client.post("/api/blog/", json={"title": "Live", "summary": "s", "content": "public", "tags": ["t"]})
+    client.post("/api/blog/", json={"title": "Draft", "summary": "s", "content": "secret", "published": False}, headers=admin)
+
+    backup = client.get("/api/blog/backup").json()
+    assert [p["slug"] for p in backup] == ["live"]
+    res = client.post("/api/blog/restore", params={"mode": "replace"}, json=backup)
+    assert res.status_code == 200
+    assert res.json() == {"ok": True, "count": 1}
+    assert client.get("/api/blog/draft", headers=admin).json()["content"] == "secret"
+    assert client.get("/api/blog/", headers=admin).headers["X-Total-Count"] == "2"
+
+    # Without the token a restore can't write or overwrite drafts
+    as_draft = [{**backup[0], "published": False}]
+    assert client.post("/api/blog/restore", json=as_draft).status_code == 403
+    overwrite = [{**backup[0], "slug": "draft"}]
+    assert client.post("/api/blog/restore", params={"mode": "merge"}, json=overwrite).status_code == 403
+    assert client.get("/api/blog/draft", headers=admin).json()["content"] == "secret"
+
+    # The admin backup round-trips drafts too
+    full = client.get("/api/blog/backup", headers=admin).json()
+    assert client.post("/api/blog/restore", json=full, headers=admin).status_code == 200
+    assert client.get("/api/blog/draft", headers=admin).json()["published"] is False
+
+
+def test_import_batch_reports_each_url(client: TestClient) -> None:
+    ok_url = "https://medium.com/@author/how-to-build-scalable-microservices-abc123"
+    alt_url = "https://medium.com/@author/advanced-typescript-patterns"
+    dup_url = "https://blog.example.com/same-title-again"
+    missing_url = "https://medium.com/@author/gone"
+    with respx.mock:
+        respx.get(ok_url).mock(return_value=httpx.Response(200, text=MEDIUM_HTML))
+        respx.get(alt_url).mock(return_value=httpx.Response(200, text=MEDIUM_HTML_ALT))
+        respx.get(dup_url).mock(return_value=httpx.Response(200, text=MEDIUM_HTML))
+        respx.get(missing_url).mock(return_value=httpx.Response(404))
+        res = client.post(
+            "/api/blog/import/batch",
+            json={"urls": [ok_url, alt_url, dup_url, missing_url, ok_url], "tags": ["Imported"]},
+        )
+    assert res.status_code == 200
+    body = res.json()
+    assert (body["imported"], body["failed"]) == (2, 2)
+    results = {r["url"]: r for r in body["results"]}
+    assert results[ok_url]["slug"] == "how-to-build-scalable-microservices"
+    assert results[dup_url]["error"] == "Slug already exists"
+    assert results[missing_url]["error"].startswith("Could not fetch URL")
+
+    listed = client.get("/api/blog/")
+    assert listed.headers["X-Total-Count"] == "2"
+    assert client.get("/api/blog/tags").json() == [{"tag": "imported", "count": 2}]
+
+
+def test_import_batch_isolates_unexpected_errors(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    ok_url = "https://medium.com/@author/how-to-build-scalable-microservices-abc123"
+    bad_url = "https://medium.com/@author/advanced-typescript-patterns"
+    parse = blog_router._parse_article_html
+
+    def flaky_parse(html: str, url: str) -> blog_router._Article:
+        if url == bad_url:
+            raise KeyError("boom")
+        return parse(html, url)
+
+    monkeypatch.setattr(blog_router, "_parse_article_html", flaky_parse)
+    with respx.mock:
+        respx.get(ok_url).mock(return_value=httpx.Response(200, text=MEDIUM_HTML))
+        respx.get(bad_url).mock(return_value=httpx.Response(200, text=MEDIUM_HTML_ALT))
+        res = client.post("/api/blog/import/batch", json={"urls": [ok_url, bad_url]})
+    assert res.status_code == 200
+    results = {r["url"]: r for r in res.json()["results"]}
+    assert results[ok_url]["ok"] is True
+    assert results[bad_url] == {"url": bad_url, "ok": False, "slug": None, "error": "Import failed: KeyError"}
+
+
+def test_imports_keep_source_publish_dates(client: TestClient) -> None:
+    older = "https://medium.com/@author/how-to-build-scalable-microservices-abc123"
+    undated = "https://medium.com/@author/advanced-typescript-patterns"
+    dated_html = MEDIUM_HTML.replace(
+        "</head>", '<meta property="article:published_time" content="2021-03-04T10:00:00+02:00" /></head>'
+    )
+    feed = SUBSTACK_RSS_XML.replace(
+        "<item>",
+        "<item><title>Newest</title><link>https://aliceguo.substack.com/p/newest</link>"
+        "<pubDate>Tue, 05 Mar 2024 09:00:00 GMT</pubDate>"
+        "<description><![CDATA[<p>Fresh.</p>]]></description></item><item>"
+        "<pubDate>Wed, 01 Feb 2023 12:00:00 GMT</pubDate>",
+        1,
+    )
+    with respx.mock:
+        respx.get(older).mock(return_value=httpx.Response(200, text=dated_html))
+        respx.get(undated).mock(return_value=httpx.Response(200, text=MEDIUM_HTML_ALT))
+        respx.get("https://aliceguo.substack.com/feed").mock(return_value=httpx.Response(200, text=feed))
+        assert client.post("/api/blog/import/batch", json={"urls": [older, undated]}).json()["imported"] == 2
+        assert client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"}).json()["imported"] == 2
+
+    posts = {p["slug"]: p["created_at"] for p in client.get("/api/blog/").json()}
+    assert list(posts) == ["advanced-typescript-patterns", "newest", "test-post-from-rss", "how-to-build-scalable-microservices"]
+    assert posts["newest"].startswith("2024-03-05T09:00:00")
+    assert posts["test-post-from-rss"].startswith("2023-02-01T12:00:00")
+    assert posts["how-to-build-scalable-microservices"].startswith("2021-03-04T08:00:00")
+
+
+def test_substack_feed_fetched_once_and_revalidated(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    feed_url = "https://aliceguo.substack.com/feed"
+    second = SUBSTACK_RSS_XML.replace(
+        "<item>",
+        "<item><title>Second Post</title><link>https://aliceguo.substack.com/p/second-post</link>"
+        "<description><![CDATA[<p>Second body.</p>]]></description></item><item>",
+        1,
+    )
+    urls = ["https://aliceguo.substack.com/p/test-post-from-rss", "https://aliceguo.substack.com/p/second-post"]
+    with respx.mock:
+        feed_route = respx.get(feed_url).mock(
+            side_effect=lambda request: httpx.Response(304)
+            if request.headers.get("if-none-match") == '"v1"'
+            else httpx.Response(200, text=second, headers={"ETag": '"v1"'})
+        )
+        res = client.post("/api/blog/import/batch", json={"urls": urls})
+        assert res.json()["imported"] == 2
+        assert feed_route.call_count == 1
+
+        # Past the TTL the feed is revalidated with its ETag, and the 304 keeps the index
+        monkeypatch.setenv("SUBSTACK_FEED_TTL", "0")
+        get_settings.cache_clear()
+        client.delete("/api/blog/second-post")
+        assert client.post("/api/blog/import", json={"url": urls[1]}).json()["title"] == "Second Post"
+        assert feed_route.call_count == 2
+        assert feed_route.calls.last.response.status_code == 304
+
+
+def test_substack_feed_served_stale_on_errors_and_bounded(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    url = "https://aliceguo.substack.com/p/test-post-from-rss"
+    with respx.mock:
+        feed_route = respx.get("https://aliceguo.substack.com/feed").mock(
+            return_value=httpx.Response(200, text=SUBSTACK_RSS_XML)
+        )
+        assert client.post("/api/blog/import", json={"url": url}).status_code == 200
+
+        # Past the TTL every feed URL fails: the cached index keeps serving imports
+        monkeypatch.setenv("SUBSTACK_FEED_TTL", "0")
+        get_settings.cache_clear()
+        feed_route.mock(return_value=httpx.Response(503))
+        respx.get("https://substack.com/@aliceguo/feed").mock(side_effect=httpx.ConnectError("down"))
+        client.delete("/api/blog/test-post-from-rss")
+        assert client.post("/api/blog/import", json={"url": url}).status_code == 200
+        assert blog_router._FEEDS["aliceguo"].feed_url == "https://aliceguo.substack.com/feed"
+
+    monkeypatch.setattr(blog_router, "_MAX_FEEDS", 2)
+    for name in ("a", "b", "c"):
+        blog_router._remember_feed(name, blog_router._SubstackFeed(feed_url=None))
+    assert list(blog_router._FEEDS) == ["b", "c"]
+
+
+def test_substack_sync_imports_only_unseen_entries(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    feed_url = "https://aliceguo.substack.com/feed"
+    newer = SUBSTACK_RSS_XML.replace(
+        "<item>",
+        "<item><title>Newer Post</title><link>https://aliceguo.substack.com/p/newer-post</link>"
+        "<guid>https://aliceguo.substack.com/p/newer-post</guid>"
+        "<description><![CDATA[<p>Fresh.</p>]]></description></item><item>",
+        1,
+    )
+    feeds = {'"v1"': SUBSTACK_RSS_XML, '"v2"': newer}
+    current = {"etag": '"v1"'}
+
+    def serve(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == current["etag"]:
+            return httpx.Response(304)
+        return httpx.Response(200, text=feeds[current["etag"]], headers={"ETag": current["etag"]})
+
+    with respx.mock:
+        route = respx.get(feed_url).mock(side_effect=serve)
+        first = client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"}).json()
+        assert (first["changed"], first["imported"]) == (True, 1)
+
+        # Unchanged feed: one conditional request, nothing parsed or inserted
+        monkeypatch.setattr(blog_router, "_entry_to_article", lambda entry: pytest.fail("parsed"))
+        again = client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"}).json()
+        assert (again["changed"], again["imported"]) == (False, 0)
+        assert route.calls.last.response.status_code == 304
+        monkeypatch.undo()
+
+        # A new post: only it is converted and inserted
+        current["etag"] = '"v2"'
+        third = client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"}).json()
+        assert [r["slug"] for r in third["results"]] == ["newer-post"]
+        assert route.call_count == 3
+    assert client.get("/api/blog/").headers["X-Total-Count"] == "2"
+
+
+def test_import_rejects_oversized_page(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("IMPORT_MAX_BYTES", "1000")
+    get_settings.cache_clear()
+    url = "https://blog.example.com/huge"
+    with respx.mock:
+        respx.get(url).mock(return_value=httpx.Response(200, text=GENERIC_HTML + "<!--" + "x" * 2000 + "-->"))
+        res = client.post("/api/blog/import", json={"url": url})
+    assert res.status_code == 422
+    assert "larger than 1000 bytes" in res.json()["detail"]
+
+
+def test_substack_feed_parsing_runs_in_import_pool(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    pooled: list[str] = []
+    run = blog_router.import_pool.run
+
+    async def recording_run(fn: Callable[..., Any], *args: Any) -> Any:
+        pooled.append(fn.__name__)
+        return await run(fn, *args)
+
+    monkeypatch.setattr(blog_router.import_pool, "run", recording_run)
+    with respx.mock:
+        respx.get("https://aliceguo.substack.com/feed").mock(return_value=httpx.Response(200, text=SUBSTACK_RSS_XML))
+        imported = client.post("/api/blog/import", json={"url": "https://aliceguo.substack.com/p/test-post-from-rss"})
+        assert imported.status_code == 200
+        assert pooled == ["_index_feed", "_entry_to_article"]
+
+        pooled.clear()
+        client.delete("/api/blog/test-post-from-rss")
+        synced = client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"}).json()
+        assert synced["imported"] == 1
+        assert pooled == ["_index_feed", "_entry_to_article"]
+
+
+def test_sync_rejects_oversized_feed(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("IMPORT_MAX_BYTES", "200")
+    get_settings.cache_clear()
+    with respx.mock:
+        respx.get("https://aliceguo.substack.com/feed").mock(return_value=httpx.Response(200, text=SUBSTACK_RSS_XML))
+        respx.get("https://substack.com/@aliceguo/feed").mock(return_value=httpx.Response(200, text=SUBSTACK_RSS_XML))
+        res = client.post("/api/blog/sync/substack", json={"newsletter": "aliceguo"})
+    assert res.status_code == 502
+    assert client.get("/api/blog/").headers["X-Total-Count"] == "0"
@@ -1,6 +1,18 @@
-"""Tests for Redis cache layer (no-op when REDIS_URL unset)."""
+"""Tests for Redis cache layer (no-op when REDIS_URL unset) and its in-process tier."""
 
-from app.services.cache import cache_key, get_cached, set_cached
+import asyncio
+import time
+from collections.abc import Iterator
+
+import pytest
+from app.config import get_settings
+from app.services import cache
+from app.services.cache import (
+    cache_key,
+    get_cached,
+    invalidate_pattern,
+    set_cached,
+)
 
 
 def test_cache_key_without_user_hint() -> None:
@@ -24,3 +36,143 @@ def test_get_cached_returns_none_when_redis_unset() -> None:
 def test_set_cached_no_op_when_redis_unset() -> None:
     """When REDIS_URL is not set, set_cached does not raise."""
     set_cached("portfolio:test:key", {"a": 1}, 60)
+
+
+def test_cache_key_matches_invalidation_prefix() -> None:
+    """Keys must start with the same prefix invalidate_pattern() scans for."""
+    assert cache_key("blog:list", "1", "20") == "portfolio:blog:list:1:20"
+
+
+@pytest.fixture(autouse=True)
+def fresh_generations() -> Iterator[None]:
+    cache._Generations.values.clear()
+    yield
+    cache._Generations.values.clear()
+
+
+@pytest.fixture
+def local_tier(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Local tier switched on as if the pub/sub listener were running, with small limits."""
+    monkeypatch.setenv("CACHE_LOCAL_MAX_ENTRIES", "2")
+    monkeypatch.setenv("CACHE_LOCAL_MAX_BYTES", "100")
+    get_settings.cache_clear()
+    monkeypatch.setattr(cache._Local, "listener", object())
+    yield
+    cache._local_clear()
+    get_settings.cache_clear()
+
+
+def test_local_hit_skips_redis(local_tier: None) -> None:
+    cache._local_set("portfolio:blog:post:a", {"slug": "a"}, 20, 60)
+    assert get_cached("portfolio:blog:post:a") == {"slug": "a"}
+
+
+def test_local_tier_evicts_least_recently_used(local_tier: None) -> None:
+    cache._local_set("portfolio:a", 1, 10, 60)
+    cache._local_set("portfolio:b", 2, 10, 60)
+    assert get_cached("portfolio:a") == 1  # a is now more recent than b
+    cache._local_set("portfolio:c", 3, 10, 60)
+    assert get_cached("portfolio:b") is None
+    assert get_cached("portfolio:a") == 1 and get_cached("portfolio:c") == 3
+
+
+def test_local_tier_respects_byte_limit(local_tier: None) -> None:
+    cache._local_set("portfolio:a", 1, 60, 60)
+    cache._local_set("portfolio:b", 2, 60, 60)
+    assert get_cached("portfolio:a") is None
+    assert cache._Local.size == 60
+    cache._local_set("portfolio:huge", 3, 101, 60)
+    assert get_cached("portfolio:huge") is None
+    assert get_cached("portfolio:b") == 2
+
+
+def test_local_entries_expire(local_tier: None) -> None:
+    cache._local_set("portfolio:a", 1, 10, 0)
+    assert get_cached("portfolio:a") is None
+    assert cache._Local.size == 0
+
+
+def test_invalidate_pattern_drops_local_copies(local_tier: None) -> None:
+    cache._local_set("portfolio:blog:post:a", 1, 10, 60)
+    cache._local_set("portfolio:github:repos:x", 2, 10, 60)
+    invalidate_pattern("blog:")
+    assert get_cached("portfolio:blog:post:a") is None
+    assert get_cached("portfolio:github:repos:x") == 2
+
+
+def test_broadcasts_from_other_workers_invalidate(local_tier: None) -> None:
+    cache._local_set("portfolio:blog:list:1", 1, 10, 60)
+    cache._on_invalidate({"data": f"{cache._WORKER_ID} portfolio:blog:"})
+    assert get_cached("portfolio:blog:list:1") == 1  # own broadcast is ignored
+    cache._on_invalidate({"data": "other-worker portfolio:blog:"})
+    assert get_cached("portfolio:blog:list:1") is None
+
+
+def test_start_is_no_op_when_redis_unset() -> None:
+    cache.start()
+    assert cache._Local.listener is None
+    asyncio.run(cache.stop())
+
+
+def test_async_api_no_op_when_redis_unset() -> None:
+    async def scenario() -> None:
+        await cache.aset_many({"portfolio:a": 1, "portfolio:b": 2}, 60)
+        assert await cache.aget_many(["portfolio:a", "portfolio:b"]) == [None, None]
+        assert await cache.aget_cached("portfolio:a") is None
+        await cache.ainvalidate_namespace("blog")
+        await cache.araise_counter("portfolio:version:test", 3)
+        assert await cache.aget_counter("portfolio:version:test") is None
+
+    asyncio.run(scenario())
+
+
+def test_get_many_mixes_local_hits_and_misses(local_tier: None) -> None:
+    cache._local_set("portfolio:b", 2, 10, 60)
+    assert cache.get_many(["portfolio:a", "portfolio:b"]) == [None, 2]
+    assert asyncio.run(cache.aget_many(["portfolio:a", "portfolio:b"])) == [None, 2]
+
+
+def test_apply_get_fills_local_tier_with_redis_ttl(local_tier: None) -> None:
+    keys = ["portfolio:a", "portfolio:b", "portfolio:c"]
+    results = [1, None, None]
+    # Replies for one pipeline: MGET of the two missing keys, then their TTLs
+    replies = [['{"x": 2}', None], 120, -2]
+    assert cache._apply_get(keys, results, [1, 2], replies) == [1, {"x": 2}, None]
+    assert cache._Local.entries["portfolio:b"][1] == len('{"x": 2}')
+
+
+def test_encode_response_compresses_past_threshold() -> None:
+    small = cache.encode_response({"a": 1}, {"ETag": '"v1"'})
+    assert small.encoding is None and small.body == b'{"a":1}'
+    large = cache.encode_response({"text": "x" * 5000}, {})
+    assert large.encoding == "gzip"
+    assert len(large.body) < 5000
+    assert cache.CachedResponse.unpack(large.pack()) == large
+
+
+def test_response_entries_served_from_local_tier(local_tier: None) -> None:
+    entry = cache.encode_response([{"slug": "a"}], {"X-Total-Count": "1"})
+    cache._local_set("portfolio:blog:list:1", entry, len(entry.body), 60)
+    assert asyncio.run(cache.aget_response("portfolio:blog:list:1")) is entry
+    assert asyncio.run(cache.aget_response("portfolio:blog:list:2")) is None
+
+
+def test_generation_keys_change_on_namespace_invalidation() -> None:
+    async def scenario() -> None:
+        before = await cache.acache_key("blog:list", "1", "20")
+        assert before == "portfolio:blog:g0:list:1:20"
+        github = await cache.acache_key("github:repos", "octocat")
+        await cache.ainvalidate_namespace("blog")
+        assert await cache.acache_key("blog:list", "1", "20") == "portfolio:blog:g1:list:1:20"
+        assert await cache.acache_key("github:repos", "octocat") == github
+        assert await cache.acache_key("blog") == "portfolio:blog:g1"
+
+    asyncio.run(scenario())
+
+
+def test_generation_broadcast_from_other_worker_forces_reread() -> None:
+    cache._Generations.values["blog"] = (7, time.monotonic())
+    cache._on_invalidate({"data": f"{cache._WORKER_ID} portfolio:gen:blog"})
+    assert "blog" in cache._Generations.values
+    cache._on_invalidate({"data": "other-worker portfolio:gen:blog"})
+    assert "blog" not in cache._Generations.values
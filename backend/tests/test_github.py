@@ -0,0 +1,371 @@
+"""Tests for /api/github/repos caching: singleflight misses, stale-while-revalidate, negative caching."""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import httpx
+import pytest
+import respx
+from app.config import get_settings
+from app.main import app
+from app.routers import github
+from app.services import cache as cache_svc
+from app.services import http_clients
+
+REPOS_URL = "https://api.github.com/users/octocat/repos"
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch: pytest.MonkeyPatch) -> Iterator[dict[str, Any]]:
+    """In-memory stand-in for Redis so cache behaviour is observable without a server."""
+    data: dict[str, Any] = {}
+
+    async def aget_many(keys: list[str]) -> list[Any]:
+        return [data.get(key) for key in keys]
+
+    async def aset_many(items: dict[str, Any], ttl: int) -> None:
+        data.update(items)
+
+    monkeypatch.setattr(cache_svc, "aget_many", aget_many)
+    monkeypatch.setattr(cache_svc, "aset_many", aset_many)
+    yield data
+    asyncio.run(http_clients.close())
+    github._RateLimit.remaining = None
+    github._RateLimit.reset = 0.0
+    github._RateLimit.blocked_until = 0.0
+
+
+def _repo(name: str) -> dict[str, Any]:
+    return {"id": 1, "name": name, "full_name": f"octocat/{name}", "topics": []}
+
+
+async def _get(client: httpx.AsyncClient, username: str = "octocat", **params: Any) -> httpx.Response:
+    return await client.get("/api/github/repos", params={"username": username, **params})
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_concurrent_misses_share_one_upstream_call() -> None:
+    async def slow_upstream(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[_repo("hello")])
+
+    async def scenario() -> list[httpx.Response]:
+        async with _client() as client:
+            return await asyncio.gather(*(_get(client) for _ in range(5)))
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(side_effect=slow_upstream)
+        responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200] * 5
+    assert all(r.json()[0]["name"] == "hello" for r in responses)
+    assert route.call_count == 1
+    assert not github._REFRESHES
+
+
+def test_stale_entry_served_while_refreshing(store: dict[str, Any]) -> None:
+    key = cache_svc.cache_key("github:repos", "octocat", "12", "1")
+    store[key] = {"status": 200, "fetched_at": time.time() - 3600, "repos": [_repo("old")]}
+
+    async def scenario() -> httpx.Response:
+        async with _client() as client:
+            resp = await _get(client)
+            await asyncio.gather(*github._REFRESHES.values())
+            return resp
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[_repo("new")]))
+        resp = asyncio.run(scenario())
+    assert resp.json()[0]["name"] == "old"
+    assert route.call_count == 1
+    assert store[key]["repos"][0]["name"] == "new"
+
+
+def test_fresh_entry_skips_upstream(store: dict[str, Any]) -> None:
+    key = cache_svc.cache_key("github:repos", "octocat", "12", "1")
+    store[key] = {"status": 200, "fetched_at": time.time(), "repos": [_repo("cached")]}
+
+    async def scenario() -> httpx.Response:
+        async with _client() as client:
+            return await _get(client)
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[]))
+        resp = asyncio.run(scenario())
+    assert resp.json()[0]["name"] == "cached"
+    assert route.call_count == 0
+
+
+def test_unknown_user_is_negatively_cached() -> None:
+    async def scenario() -> list[httpx.Response]:
+        async with _client() as client:
+            return [await _get(client, "nobody"), await _get(client, "nobody")]
+
+    with respx.mock:
+        route = respx.get("https://api.github.com/users/nobody/repos").mock(
+            return_value=httpx.Response(404, json={"message": "Not Found"})
+        )
+        responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [404, 404]
+    assert route.call_count == 1
+
+
+def test_upstream_error_is_not_cached(store: dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTP_RETRIES", "0")
+    get_settings.cache_clear()
+
+    async def scenario() -> httpx.Response:
+        async with _client() as client:
+            return await _get(client)
+
+    with respx.mock:
+        respx.get(REPOS_URL).mock(return_value=httpx.Response(502, text="bad gateway"))
+        resp = asyncio.run(scenario())
+    get_settings.cache_clear()
+    assert resp.status_code == 502
+    assert "bad gateway" not in resp.text
+    assert not store
+
+
+def test_secondary_rate_limit_blocks_only_until_retry_after() -> None:
+    primary_reset = str(int(time.time()) + 3000)
+
+    async def scenario() -> list[httpx.Response]:
+        async with _client() as client:
+            blocked = [await _get(client), await _get(client)]
+            await asyncio.sleep(1.1)
+            return [*blocked, await _get(client)]
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(
+            side_effect=[
+                httpx.Response(
+                    403,
+                    json={"message": "You have exceeded a secondary rate limit"},
+                    headers={"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": primary_reset, "Retry-After": "1"},
+                ),
+                httpx.Response(200, json=[_repo("back")]),
+            ]
+        )
+        first, second, third = asyncio.run(scenario())
+    assert (first.status_code, second.status_code) == (503, 503)
+    assert "secondary" not in first.text
+    assert first.headers["Retry-After"] == "1"  # GitHub's backoff, not the primary window
+    assert github._RateLimit.remaining == 4000
+    assert third.status_code == 200
+    assert route.call_count == 2
+
+
+def test_plain_403_does_not_trip_rate_limiter() -> None:
+    async def scenario() -> list[httpx.Response]:
+        async with _client() as client:
+            return [await _get(client), await _get(client, "someone-else")]
+
+    with respx.mock:
+        forbidden = respx.get(REPOS_URL).mock(
+            return_value=httpx.Response(403, json={"message": "Repository access blocked"}, headers={"X-RateLimit-Remaining": "4000"})
+        )
+        other = respx.get("https://api.github.com/users/someone-else/repos").mock(
+            return_value=httpx.Response(200, json=[_repo("fine")])
+        )
+        first, second = asyncio.run(scenario())
+    assert first.status_code == 502
+    assert "blocked" not in first.text
+    assert second.status_code == 200
+    assert (forbidden.call_count, other.call_count) == (1, 1)
+
+
+def test_stale_entry_revalidated_with_etag(store: dict[str, Any]) -> None:
+    key = cache_svc.cache_key("github:repos", "octocat", "12", "1")
+    stale_at = time.time() - 3600
+    store[key] = {"status": 200, "fetched_at": stale_at, "repos": [_repo("same")], "etag": '"abc"'}
+
+    async def scenario() -> None:
+        async with _client() as client:
+            await _get(client)
+            await asyncio.gather(*github._REFRESHES.values())
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(return_value=httpx.Response(304))
+        asyncio.run(scenario())
+    assert route.calls.last.request.headers["If-None-Match"] == '"abc"'
+    assert store[key]["repos"][0]["name"] == "same"
+    assert store[key]["etag"] == '"abc"'
+    assert store[key]["fetched_at"] > stale_at
+
+
+def test_etag_stored_from_upstream(store: dict[str, Any]) -> None:
+    async def scenario() -> None:
+        async with _client() as client:
+            await _get(client)
+
+    with respx.mock:
+        respx.get(REPOS_URL).mock(
+            return_value=httpx.Response(200, json=[_repo("hello")], headers={"ETag": 'W/"v1"'})
+        )
+        asyncio.run(scenario())
+    (entry,) = store.values()
+    assert entry["etag"] == 'W/"v1"'
+
+
+def test_all_mode_fetches_remaining_pages_concurrently() -> None:
+    link = f'<{REPOS_URL}?page=2>; rel="next", <{REPOS_URL}?page=3>; rel="last"'
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        assert request.url.params["per_page"] == "100"
+        count = 100 if page < 3 else 50
+        headers = {"Link": link} if page == 1 else {}
+        return httpx.Response(200, json=[_repo(f"p{page}-{i}") for i in range(count)], headers=headers)
+
+    async def scenario() -> httpx.Response:
+        async with _client() as client:
+            return await _get(client, all="true")
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(side_effect=upstream)
+        resp = asyncio.run(scenario())
+    names = [r["name"] for r in resp.json()]
+    assert len(names) == 250
+    assert names[0] == "p1-0" and names[100] == "p2-0" and names[-1] == "p3-49"
+    assert route.call_count == 3
+
+
+def test_upstream_rate_limit_becomes_503_not_403() -> None:
+    reset = str(int(time.time()) + 120)
+
+    async def scenario() -> list[httpx.Response]:
+        async with _client() as client:
+            return [await _get(client), await _get(client, "someone-else")]
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(
+            return_value=httpx.Response(
+                403,
+                json={"message": "API rate limit exceeded"},
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+            )
+        )
+        responses = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [503, 503]
+    assert 0 < int(responses[0].headers["Retry-After"]) <= 120
+    # the second request was refused locally without spending another call
+    assert route.call_count == 1
+
+
+def test_stale_entry_served_without_refresh_near_rate_limit(store: dict[str, Any]) -> None:
+    key = cache_svc.cache_key("github:repos", "octocat", "12", "1")
+    store[key] = {"status": 200, "fetched_at": time.time() - 3600, "repos": [_repo("old")]}
+    github._RateLimit.remaining = 10
+    github._RateLimit.reset = time.time() + 600
+
+    async def scenario() -> httpx.Response:
+        async with _client() as client:
+            return await _get(client)
+
+    with respx.mock:
+        route = respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[]))
+        resp = asyncio.run(scenario())
+    assert resp.json()[0]["name"] == "old"
+    assert route.call_count == 0
+    assert not github._REFRESHES
+
+
+def test_warm_targets_parsed_from_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_WARM", "octocat, octocat:30 ,torvalds:all,typo:3O,big:500")
+    get_settings.cache_clear()
+    try:
+        # Malformed sizes are skipped, not fatal at startup
+        assert github._warm_targets() == [("octocat", 12, False), ("octocat", 30, False), ("torvalds", 12, True)]
+    finally:
+        get_settings.cache_clear()
+
+
+def test_warmed_list_served_without_upstream_call(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_WARM", "octocat")
+    get_settings.cache_clear()
+
+    async def scenario() -> httpx.Response:
+        await github.warm_cache()
+        async with _client() as client:
+            return await _get(client)
+
+    try:
+        with respx.mock:
+            route = respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[_repo("warm")]))
+            resp = asyncio.run(scenario())
+    finally:
+        get_settings.cache_clear()
+    assert resp.json()[0]["name"] == "warm"
+    assert route.call_count == 1
+
+
+def test_warm_cache_survives_upstream_errors(store: dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_WARM", "octocat")
+    monkeypatch.setenv("HTTP_RETRIES", "0")
+    get_settings.cache_clear()
+    try:
+        with respx.mock:
+            respx.get(REPOS_URL).mock(return_value=httpx.Response(500))
+            asyncio.run(github.warm_cache())
+    finally:
+        get_settings.cache_clear()
+    assert not store
+
+
+def test_warmup_task_follows_lifespan(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_WARM", "octocat")
+    get_settings.cache_clear()
+
+    async def scenario() -> None:
+        github.start_warmup()
+        task = github._Warmup.task
+        assert task is not None
+        await asyncio.sleep(0.05)
+        await github.stop_warmup()
+        assert task.cancelled() and github._Warmup.task is None
+
+    try:
+        with respx.mock:
+            route = respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[]))
+            asyncio.run(scenario())
+    finally:
+        get_settings.cache_clear()
+    assert route.call_count == 1
+
+
+def test_warmup_loop_survives_unexpected_errors(store: dict[str, Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GITHUB_WARM", "octocat")
+    monkeypatch.setenv("GITHUB_WARM_INTERVAL", "0.01")
+    get_settings.cache_clear()
+    rounds = {"n": 0}
+    aget_many = cache_svc.aget_many
+
+    async def flaky_get_many(keys: list[str]) -> list[Any]:
+        rounds["n"] += 1
+        if rounds["n"] == 1:
+            raise ConnectionError("cache down")
+        return await aget_many(keys)
+
+    monkeypatch.setattr(cache_svc, "aget_many", flaky_get_many)
+
+    async def scenario() -> None:
+        github.start_warmup()
+        for _ in range(100):
+            if store:
+                break
+            await asyncio.sleep(0.01)
+        await github.stop_warmup()
+
+    try:
+        with respx.mock:
+            respx.get(REPOS_URL).mock(return_value=httpx.Response(200, json=[_repo("warm")]))
+            asyncio.run(scenario())
+    finally:
+        get_settings.cache_clear()
+    assert rounds["n"] >= 2
+    assert store
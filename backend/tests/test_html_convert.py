@@ -0,0 +1,31 @@
+"""Tests for the single-parse HTML to markdown conversion used by blog imports."""
+
+import pytest
+from app.services import html_convert
+from markdownify import markdownify
+
+
+@pytest.fixture(params=["html.parser", html_convert.PARSER])
+def parser(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    monkeypatch.setattr(html_convert, "PARSER", request.param)
+    return request.param
+
+
+def test_fragment_matches_markdownify_output(parser: str) -> None:
+    html = "<h2>Part</h2><p>Some <b>bold</b> and <code>snake_case</code>.</p><script>x()</script><ul><li>one</li></ul>"
+    summary, markdown = html_convert.convert_fragment(html)
+    expected = markdownify(
+        html.replace("<script>x()</script>", ""),
+        heading_style="ATX",
+        escape_asterisks=False,
+        escape_underscores=False,
+    ).strip()
+    assert markdown == expected.replace("\n\n\n", "\n\n")
+    assert summary == "Part Some bold and snake_case . one"
+
+
+def test_summary_truncates_and_falls_back_to_title(parser: str) -> None:
+    summary, _ = html_convert.convert_fragment("<p>" + "word " * 100 + "</p>")
+    assert len(summary) == html_convert.SUMMARY_LENGTH
+    assert summary.endswith("...")
+    assert html_convert.convert_fragment("<img src='a.png'>", title="Only Title")[0] == "Only Title"
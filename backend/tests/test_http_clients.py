@@ -0,0 +1,82 @@
+"""Tests for shared upstream clients: retries with backoff and per-host circuit breaking."""
+
+import asyncio
+from collections.abc import Iterator
+
+import httpx
+import pytest
+import respx
+from app.config import get_settings
+from app.services import http_clients
+
+
+@pytest.fixture(autouse=True)
+def fast_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("HTTP_BACKOFF", "0")
+    monkeypatch.setenv("HTTP_RETRIES", "1")
+    monkeypatch.setenv("HTTP_CIRCUIT_FAILURES", "2")
+    get_settings.cache_clear()
+    yield
+    asyncio.run(http_clients.close())
+    get_settings.cache_clear()
+
+
+def test_retries_server_errors_then_succeeds() -> None:
+    with respx.mock:
+        route = respx.get("https://example.com/feed").mock(
+            side_effect=[httpx.Response(503), httpx.Response(200, text="ok")]
+        )
+        resp = asyncio.run(http_clients.web().get("https://example.com/feed"))
+    assert resp.status_code == 200
+    assert route.call_count == 2
+
+
+def test_circuit_opens_per_host_and_fails_fast() -> None:
+    async def scenario() -> None:
+        client = http_clients.web()
+        for _ in range(2):
+            assert (await client.get("https://down.example.com/")).status_code == 502
+        with pytest.raises(http_clients.CircuitOpenError):
+            await client.get("https://down.example.com/")
+        # Other hosts are unaffected
+        assert (await client.get("https://up.example.com/")).status_code == 200
+
+    with respx.mock:
+        down = respx.get("https://down.example.com/").mock(return_value=httpx.Response(502))
+        respx.get("https://up.example.com/").mock(return_value=httpx.Response(200))
+        asyncio.run(scenario())
+    assert down.call_count == 4  # two requests, each retried once; the third never left
+
+
+def test_rate_limit_is_retried_but_never_opens_circuit() -> None:
+    async def scenario() -> None:
+        client = http_clients.github()
+        for _ in range(3):
+            assert (await client.get("/users/x/repos")).status_code == 429
+
+    with respx.mock:
+        route = respx.get("https://api.github.com/users/x/repos").mock(
+            return_value=httpx.Response(429, headers={"Retry-After": "0"})
+        )
+        asyncio.run(scenario())
+    assert route.call_count == 6
+
+
+def test_failed_trial_releases_half_open_circuit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("HTTP_CIRCUIT_COOLDOWN", "0")
+    get_settings.cache_clear()
+
+    async def scenario() -> None:
+        client = http_clients.web()
+        for _ in range(2):
+            assert (await client.get("https://flaky.example.com/")).status_code == 502
+        # The half-open trial dies with a non-transport error; the next request is the new trial
+        with pytest.raises(RuntimeError):
+            await client.get("https://flaky.example.com/")
+        assert (await client.get("https://flaky.example.com/")).status_code == 200
+
+    with respx.mock:
+        respx.get("https://flaky.example.com/").mock(
+            side_effect=[httpx.Response(502)] * 4 + [RuntimeError("boom"), httpx.Response(200)]
+        )
+        asyncio.run(scenario())
@@ -0,0 +1,92 @@
+"""Tests for the import parsing process pool."""
+
+import asyncio
+import signal
+import time
+from collections.abc import Iterator
+
+import pytest
+from app.config import get_settings
+from app.routers import blog
+from app.services import html_convert, import_pool
+
+
+@pytest.fixture()
+def pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setenv("IMPORT_WORKERS", "1")
+    monkeypatch.setenv("IMPORT_PARSE_TIMEOUT", "1")
+    get_settings.cache_clear()
+    import_pool.start()
+    yield
+    import_pool.shutdown()
+    get_settings.cache_clear()
+
+
+def _ignore_deadline(seconds: float) -> str:
+    """Stands in for a parse stuck in C code: the worker's deadline signal can't interrupt it."""
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    try:
+        time.sleep(seconds)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGALRM})
+    return "done"
+
+
+def test_runs_in_worker_process(pool: None) -> None:
+    summary, markdown = asyncio.run(import_pool.run(html_convert.convert_fragment, "<h1>Hi</h1><p>there</p>"))
+    assert markdown == "# Hi\n\nthere"
+    assert summary == "Hi there"
+
+
+def test_timeout_interrupts_only_the_slow_parse(pool: None) -> None:
+    executor = import_pool._Pool.executor
+
+    async def both() -> list[object]:
+        # One worker: the quick parse is queued behind the runaway one
+        return await asyncio.gather(
+            import_pool.run(time.sleep, 30),
+            import_pool.run(html_convert.convert_fragment, "<p>x</p>"),
+            return_exceptions=True,
+        )
+
+    started = time.monotonic()
+    slow, quick = asyncio.run(both())
+    assert time.monotonic() - started < 10
+    assert isinstance(slow, ValueError)
+    assert "longer than 1s" in str(slow)
+    assert quick == ("x", "x")
+    assert import_pool._Pool.executor is executor
+
+
+@pytest.mark.skipif(not hasattr(signal, "pthread_sigmask"), reason="needs POSIX signals")
+def test_unresponsive_worker_is_abandoned_after_grace(pool: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(import_pool, "_DEADLINE_GRACE", 0.2)
+    asyncio.run(import_pool.run(html_convert.convert_fragment, "<p>warm</p>"))  # spawn the worker
+    with pytest.raises(ValueError, match="longer than 1s"):
+        asyncio.run(import_pool.run(_ignore_deadline, 1.5))
+    # The worker finishes on its own and keeps serving
+    assert asyncio.run(import_pool.run(html_convert.convert_fragment, "<p>x</p>")) == ("x", "x")
+
+
+def test_feed_indexed_in_worker_process(pool: None) -> None:
+    rss = (
+        "<rss><channel><item><title>Hi</title><link>https://x.substack.com/p/hi-there</link>"
+        "<description><![CDATA[<p>Body</p>]]></description></item></channel></rss>"
+    )
+
+    async def scenario() -> blog._Article | None:
+        feed = await import_pool.run(blog._index_feed, "https://x.substack.com/feed", rss, '"v1"', None)
+        assert feed.etag == '"v1"' and feed.index["hi-there"] == 0
+        return await import_pool.run(blog._entry_to_article, feed.entries[0])
+
+    assert asyncio.run(scenario()) == ("Hi", "Body", "Body", None)
+
+
+def test_without_workers_uses_threadpool(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("IMPORT_WORKERS", "0")
+    get_settings.cache_clear()
+    import_pool.start()
+    assert import_pool._Pool.executor is None
+    assert asyncio.run(import_pool.run(html_convert.convert_fragment, "<p>x</p>")) == ("x", "x")
+    get_settings.cache_clear()
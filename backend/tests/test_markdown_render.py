@@ -0,0 +1,27 @@
+"""Tests for write-time markdown rendering (HTML, table of contents, reading stats)."""
+
+from app.utils.markdown_render import reading_time_minutes, render_markdown
+
+
+def test_headings_get_anchors_and_toc() -> None:
+    rendered = render_markdown("# Intro\n\ntext\n\n## Deep *Dive*\n\n## Deep Dive\n")
+    assert rendered["toc"] == [
+        {"level": 1, "text": "Intro", "id": "intro"},
+        {"level": 2, "text": "Deep Dive", "id": "deep-dive"},
+        {"level": 2, "text": "Deep Dive", "id": "deep-dive-1"},
+    ]
+    assert '<h2 id="deep-dive">Deep <em>Dive</em></h2>' in rendered["content_html"]
+
+
+def test_raw_html_and_script_links_are_neutralized() -> None:
+    html = render_markdown('<script>alert(1)</script>\n\n[x](javascript:alert(1))')["content_html"]
+    assert "<script>" not in html
+    assert 'href="javascript:' not in html
+
+
+def test_word_count_and_reading_time() -> None:
+    rendered = render_markdown("one two three\n\n```\ncode words\n```\n")
+    assert rendered["word_count"] == 5
+    assert rendered["reading_time"] == 1
+    assert reading_time_minutes(0) == 0
+    assert reading_time_minutes(401) == 3